@@ -2,14 +2,33 @@
     https://adventofcode.com/2022/day/1
 """
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+import heapq
+import os
+import random
+import sys
+from collections.abc import Iterable, Iterator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
+
+try:
+    import numpy as np
+except ImportError: # Only needed for the numpy backend
+    np = None
+
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
+
+    Args:
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
         str: A raw string of the inputs
     """
-    with open("1-calorie_counting/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+    return load_input(path).text
 
 def split_elf(inp: str) -> list:
     """Split the inputs into strings of elves
@@ -33,53 +52,451 @@ def split_elves_inventory(inp: str) -> list:
     """
     return inp.split("\n")
 
-def get_highest_calories(elf_inventories_str: str, ignore: list=None) -> int:
-    """Get the highest total calories
+def get_elf_totals(elf_inventories_str: str) -> Iterator[int]:
+    """Parse the raw inventories once, yielding each elf's total calories in order
+
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
+
+    Yields:
+        int: The total calories of each elf
+    """
+    text: str = elf_inventories_str.strip("\n")
+    if not text:
+        return # No elves
+
+    for elf in split_elf(text):
+        yield sum(int(x) for x in split_elves_inventory(elf))
+
+def read_elf_totals(path: str, chunk_size: int=65536) -> Iterator[int]:
+    """Stream each elf's total calories from a file, reading it in fixed-size chunks
+    Only the current chunk and the running total are held, so memory use stays flat
+
+    Args:
+        path (str): The path of the inventory file
+        chunk_size (int, optional): The number of characters to read at a time
+
+    Yields:
+        int: The total calories of each elf
+    """
+    current_total: int = 0
+    has_items: bool = False
+    partial_line: str = ""
+
+    with open(path, "r", encoding="utf-8") as input_file:
+        while chunk := input_file.read(chunk_size):
+            lines: list = (partial_line + chunk).split("\n")
+            partial_line = lines.pop() # May continue in the next chunk
+
+            for line in lines:
+                if line:
+                    current_total += int(line)
+                    has_items = True
+                elif has_items: # Blank line - end of this elf
+                    yield current_total
+                    current_total = 0
+                    has_items = False
+
+    if partial_line:
+        current_total += int(partial_line)
+        has_items = True
+
+    if has_items:
+        yield current_total
+
+def top_k_elves(elf_totals: Iterable[int], k: int) -> list[tuple[int, int]]:
+    """Find the k elves carrying the most calories with a bounded heap - O(n log k)
+    Elves are kept by position rather than value so equal totals are all counted
+
+    Args:
+        elf_totals (Iterable[int]): The total calories of each elf, in order
+        k (int): The number of elves to keep
+
+    Returns:
+        list[tuple[int, int]]: (elf index, total) pairs, highest total first
+    """
+    return heapq.nlargest(k, enumerate(elf_totals), key=lambda elf: elf[1])
+
+def get_k_highest_calories(elf_inventories_str: str, k: int) -> list[int]:
+    """Get the k highest total calories from a single parse of the input
 
     Args:
         elf_inventories_str (str): The raw list of elf inventories
-        ignore (list, optional): Values to ignore (for problem 2)
+        k (int): The number of totals to return
 
     Returns:
-        int: The highest total calories an elf has as an integer
+        list[int]: The k highest totals, highest first
     """
-    curr_max: int = -1
+    return [total for _, total in top_k_elves(get_elf_totals(elf_inventories_str), k)]
 
-    elves: list = split_elf(elf_inventories_str)
+def get_highest_calories(elf_inventories_str: str) -> int:
+    """Get the highest total calories
 
-    for elf in elves:
-        inventory: list = [int(x) for x in split_elves_inventory(elf)]
-        sum_inv: int = sum(inventory)
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
 
-        curr_max = sum_inv if sum_inv > curr_max and not sum_inv in ignore else curr_max
+    Returns:
+        int: The highest total calories an elf has as an integer (-1 if there are no elves)
+    """
+    highest: list = get_k_highest_calories(elf_inventories_str, 1)
 
-    return curr_max
+    return highest[0] if highest else -1
 
 def get_sum_three_highest_calories(elf_inventories_str: str) -> int:
     """Get the sum of the top three highest calories
 
     Args:
-        elf_inventories_str (str): _description_
+        elf_inventories_str (str): The raw list of elf inventories
+
+    Returns:
+        int: The sum of the three highest totals
+    """
+    return sum(get_k_highest_calories(elf_inventories_str, 3))
+
+
+def get_elf_totals_numpy(elf_inventories_str: str) -> "np.ndarray":
+    """Work out every elf's total calories with numpy
+    All the numbers are parsed in one call, then summed per elf between the blank lines
+
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
+
+    Raises:
+        ValueError: If two blank lines are in a row, which the Python parser rejects too
+
+    Returns:
+        np.ndarray: The total calories of each elf, in order
+    """
+    if np is None:
+        raise ImportError("numpy is required for the numpy backend")
+
+    text: str = elf_inventories_str.strip("\n")
+    if not text:
+        return np.zeros(0, dtype=np.int64)
+
+    calories: np.ndarray = np.fromstring(text, dtype=np.int64, sep=" ")
+
+    # A line is blank when its newline directly follows the previous one
+    newlines: np.ndarray = np.flatnonzero(np.frombuffer(text.encode(), dtype=np.uint8) == 10)
+    blank_lines: np.ndarray = np.flatnonzero(np.diff(newlines) == 1) + 1
+
+    if np.any(np.diff(blank_lines) == 1): # Would give reduceat a repeated start, a phantom elf
+        raise ValueError("elves must be separated by exactly one blank line")
+
+    # The elf after the nth blank line (from 0) starts n + 1 items fewer down than its line
+    elf_starts: np.ndarray = np.concatenate(([0], blank_lines - np.arange(len(blank_lines))))
+
+    return np.add.reduceat(calories, elf_starts)
+
+def get_k_highest_calories_numpy(elf_inventories_str: str, k: int) -> list[int]:
+    """Get the k highest total calories with numpy, partitioning rather than sorting
+
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
+        k (int): The number of totals to return
 
     Returns:
-        int: _description_
+        list[int]: The k highest totals, highest first
     """
-    outp: list = []
+    totals: np.ndarray = get_elf_totals_numpy(elf_inventories_str)
+    k = min(k, len(totals))
+
+    if k == 0:
+        return []
+
+    highest: np.ndarray = np.partition(totals, len(totals) - k)[len(totals) - k:]
+
+    return sorted(highest.tolist(), reverse=True)
+
+def get_highest_calories_numpy(elf_inventories_str: str) -> int:
+    """Get the highest total calories with numpy
+    Gives the same result as get_highest_calories
 
-    for _ in range(3):
-        outp.append(get_highest_calories(elf_inventories_str, outp))
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
+
+    Returns:
+        int: The highest total calories an elf has as an integer (-1 if there are no elves)
+    """
+    highest: list = get_k_highest_calories_numpy(elf_inventories_str, 1)
 
-    return sum(outp)
+    return highest[0] if highest else -1
+
+def get_sum_three_highest_calories_numpy(elf_inventories_str: str) -> int:
+    """Get the sum of the top three highest calories with numpy
+    Gives the same result as get_sum_three_highest_calories
+
+    Args:
+        elf_inventories_str (str): The raw list of elf inventories
+
+    Returns:
+        int: The sum of the three highest totals
+    """
+    return sum(get_k_highest_calories_numpy(elf_inventories_str, 3))
+
+class LeaderboardNode:
+    """A node in the leaderboard's treap, ordered by (-total, elf) so the most calories come first
+    """
+    __slots__ = ("key", "priority", "size", "left", "right")
 
+    key: tuple[int, int]
+    priority: float
+    size: int
+    left: "LeaderboardNode"
+    right: "LeaderboardNode"
+
+    def __init__(self, key: tuple[int, int]):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+
+def node_size(node: LeaderboardNode) -> int:
+    """The number of elves under a node
+
+    Args:
+        node (LeaderboardNode): The node (None if empty)
+
+    Returns:
+        int: The number of elves in its subtree
+    """
+    return node.size if node else 0
+
+def split_nodes(node: LeaderboardNode, key: tuple[int, int]) -> tuple:
+    """Split a treap into the nodes ordered before a key and the rest - O(log n)
+
+    Args:
+        node (LeaderboardNode): The root of the treap
+        key (tuple[int, int]): The key to split at
+
+    Returns:
+        tuple: The treap of keys before key, the treap of keys from key onwards
+    """
+    if not node:
+        return None, None
+
+    if node.key < key:
+        node.right, after = split_nodes(node.right, key)
+        node.size = node_size(node.left) + node_size(node.right) + 1
+        return node, after
+
+    before, node.left = split_nodes(node.left, key)
+    node.size = node_size(node.left) + node_size(node.right) + 1
+    return before, node
+
+def merge_nodes(first: LeaderboardNode, second: LeaderboardNode) -> LeaderboardNode:
+    """Join two treaps where every key in the first is ordered before the second - O(log n)
+
+    Args:
+        first (LeaderboardNode): The earlier treap
+        second (LeaderboardNode): The later treap
+
+    Returns:
+        LeaderboardNode: The root of the joined treap
+    """
+    if not first or not second:
+        return first or second
+
+    if first.priority > second.priority:
+        first.right = merge_nodes(first.right, second)
+        first.size = node_size(first.left) + node_size(first.right) + 1
+        return first
+
+    second.left = merge_nodes(first, second.left)
+    second.size = node_size(second.left) + node_size(second.right) + 1
+    return second
+
+class CalorieLeaderboard:
+    """Elves ranked by total calories, kept up to date as inventories change
+    Every update and query is O(log n), plus k for top-k; equal totals rank by elf index
+    """
+    root: LeaderboardNode
+    totals: list
+
+    def __init__(self, elf_totals: Iterable[int]=()):
+        self.root = None
+        self.totals = [] # Current total of each elf, by index
+
+        for total in elf_totals:
+            self.add_elf(total)
+
+    @classmethod
+    def from_inventory(cls, elf_inventories_str: str) -> "CalorieLeaderboard":
+        """Seed a leaderboard from the raw inventories
+
+        Args:
+            elf_inventories_str (str): The raw list of elf inventories
+
+        Returns:
+            CalorieLeaderboard: The leaderboard of every elf
+        """
+        return cls(get_elf_totals(elf_inventories_str))
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def insert(self, elf: int):
+        """Place an elf in the treap at its current total
+
+        Args:
+            elf (int): The elf's index
+        """
+        key: tuple[int, int] = (-self.totals[elf], elf)
+        before, after = split_nodes(self.root, key)
+
+        self.root = merge_nodes(merge_nodes(before, LeaderboardNode(key)), after)
+
+    def remove(self, elf: int):
+        """Take an elf out of the treap
+
+        Args:
+            elf (int): The elf's index
+        """
+        key: tuple[int, int] = (-self.totals[elf], elf)
+        before, rest = split_nodes(self.root, key)
+        _, after = split_nodes(rest, (key[0], key[1] + 1)) # Drop just this elf's node
+
+        self.root = merge_nodes(before, after)
+
+    def add_elf(self, total: int=0) -> int:
+        """Add a new elf
+
+        Args:
+            total (int, optional): The calories the elf starts with
+
+        Returns:
+            int: The new elf's index
+        """
+        self.totals.append(total)
+        self.insert(len(self.totals) - 1)
+
+        return len(self.totals) - 1
+
+    def add_items(self, elf: int, *calories: int):
+        """Add items to an elf's inventory
+
+        Args:
+            elf (int): The elf's index
+            calories (int): The calories of each item added
+        """
+        self.remove(elf)
+        self.totals[elf] += sum(calories)
+        self.insert(elf)
+
+    def remove_items(self, elf: int, *calories: int):
+        """Remove items from an elf's inventory
+
+        Args:
+            elf (int): The elf's index
+            calories (int): The calories of each item removed
+        """
+        if sum(calories) > self.totals[elf]:
+            raise ValueError(f"elf {elf} is not carrying {sum(calories)} calories")
+
+        self.remove(elf)
+        self.totals[elf] -= sum(calories)
+        self.insert(elf)
+
+    def max(self) -> int:
+        """Get the highest total calories
+
+        Returns:
+            int: The highest total an elf has (-1 if there are no elves)
+        """
+        node: LeaderboardNode = self.root
+
+        if not node:
+            return -1
+
+        while node.left:
+            node = node.left
+
+        return -node.key[0]
+
+    def top_k(self, k: int) -> list[tuple[int, int]]:
+        """Get the k elves carrying the most calories
+
+        Args:
+            k (int): The number of elves
+
+        Returns:
+            list[tuple[int, int]]: (elf index, total) pairs, highest total first
+        """
+        top: list = []
+        stack: list = []
+        node: LeaderboardNode = self.root
+
+        while len(top) < k and (stack or node):
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                top.append((node.key[1], -node.key[0]))
+                node = node.right
+
+        return top
+
+    def rank(self, elf: int) -> int:
+        """Get an elf's position on the leaderboard
+
+        Args:
+            elf (int): The elf's index
+
+        Returns:
+            int: The elf's rank, 1 for the most calories
+        """
+        key: tuple[int, int] = (-self.totals[elf], elf)
+        ahead: int = 0
+        node: LeaderboardNode = self.root
+
+        while node:
+            if node.key < key:
+                ahead += node_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+
+        return ahead + 1
+
+stages: dict[str, list] = { # What run.py --instrument times, per-item helpers are left out
+    "parse": ["split_elf", "get_elf_totals", "read_elf_totals", "get_elf_totals_numpy"],
+    "compute": ["top_k_elves", "get_k_highest_calories_numpy"],
+    "aggregate": [
+        "get_k_highest_calories", "get_highest_calories", "get_sum_three_highest_calories",
+        "get_highest_calories_numpy", "get_sum_three_highest_calories_numpy"
+    ],
+}
+
+def part_1(inp: str) -> int:
+    """Part 1 - the most calories carried by one elf
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The most calories carried by one elf
+    """
+    return get_highest_calories(inp)
+
+def part_2(inp: str) -> int:
+    """Part 2 - the calories carried by the top three elves
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The calories carried by the top three elves
+    """
+    return get_sum_three_highest_calories(inp)
 
 def main():
     """Main function - execute logic and print result
     """
-    highest_calories = get_highest_calories(read_input())
-    print(f"1: {highest_calories}")
-
-    highest_three_calories = get_sum_three_highest_calories(read_input())
-    print(f"2: {highest_three_calories}")
+    top_three: list = top_k_elves(read_elf_totals(input_path), 3)
+    print(f"1: {top_three[0][1] if top_three else -1}") # -1 with no elves, as get_highest_calories
+    print(f"2: {sum(total for _, total in top_three)}")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,16 @@
     https://adventofcode.com/2022/day/2
 """
 
+import os
+import sys
+from collections.abc import Iterable
+from itertools import permutations
+from typing import TextIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
+
 wins: dict[chr, chr] = {
     'A': 'Y', # Rock     - Paper
     'B': 'Z', # Paper    - Scissors
@@ -29,14 +39,18 @@ points: dict[chr, int] = {
     'E': 0  # Enemy win - 0
 }
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
+
+    Args:
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
         str: A raw string of the inputs
     """
-    with open("2-rock_paper_scissors/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+    return load_input(path).text
 
 def get_rounds(inp: str) -> list:
     """Splits the raw string into individual rounds
@@ -98,6 +112,200 @@ def calculate_points(your_move: chr, winner: chr) -> int:
     """
     return points[your_move] + points[winner]
 
+round_lines: list = [f"{enemy} {instruction}" for enemy in "ABC" for instruction in "XYZ"]
+
+def build_round_scores(standard_rule_set: bool) -> dict[str, int]:
+    """Score each of the nine possible round lines once, using the existing rules
+
+    Args:
+        standard_rule_set (bool): Whether the standard or problem 2 rule set are in use
+
+    Returns:
+        dict[str, int]: The points each round line is worth
+    """
+    round_scores: dict[str, int] = {}
+
+    for rnd in round_lines:
+        enemy_move, your_move = get_move(rnd, standard_rule_set)
+        round_scores[rnd] = calculate_points(your_move, is_winner_you(enemy_move, your_move))
+
+    return round_scores
+
+standard_round_scores: dict[str, int] = build_round_scores(True)
+second_round_scores: dict[str, int] = build_round_scores(False)
+
+def tally_rounds(guide: str) -> dict[str, int]:
+    """Count how often each of the nine round lines occurs in the guide
+    Every line is 3 characters without a newline, so a match can never span two rounds
+    Newlines at the end of the guide are ignored, any other line that isn't a round is an error
+
+    Args:
+        guide (str): The guide as a raw string
+
+    Raises:
+        ValueError: If any line is not one of the nine round lines
+
+    Returns:
+        dict[str, int]: The number of times each round line occurs
+    """
+    tally: dict[str, int] = {rnd: guide.count(rnd) for rnd in round_lines}
+
+    end: int = len(guide)
+    while end and guide[end - 1] == "\n":
+        end -= 1
+
+    lines: int = guide.count("\n", 0, end) + 1 if end else 0
+
+    if sum(tally.values()) != lines or (lines and end != 4 * lines - 1):
+        raise ValueError(f"not every one of the guide's {lines} lines is a round like 'A X'")
+
+    return tally
+
+def score_tally(tally: dict[str, int], round_scores: dict[str, int]) -> int:
+    """Total up a tally of rounds against a table of round scores
+
+    Args:
+        tally (dict[str, int]): The number of times each round line occurs
+        round_scores (dict[str, int]): The points each round line is worth
+
+    Returns:
+        int: The total score
+    """
+    return sum(count * round_scores[rnd] for rnd, count in tally.items())
+
+def counted_total_score(guide: str, standard_rule_set: bool=True) -> int:
+    """Calculate the total score the guide will net you by counting each distinct round
+    Gives the same result as guided_total_score with no per-round work
+
+    Args:
+        guide (str): The guide as a raw string
+        standard_rule_set (bool, optional): Whether the standard or problem 2 rule set are in use
+
+    Returns:
+        int: The total score the guide will net
+    """
+    round_scores: dict[str, int] = standard_round_scores if standard_rule_set \
+        else second_round_scores
+
+    return score_tally(tally_rounds(guide), round_scores)
+
+class GuideScorer:
+    """Score a guide under both rule sets at once, as it is fed in pieces
+    """
+    standard_total: int
+    second_total: int
+
+    partial_round: str
+    blank_line_fed: bool
+
+    def __init__(self):
+        self.standard_total = 0
+        self.second_total = 0
+
+        self.partial_round = "" # Round cut off at the end of the last chunk
+        self.blank_line_fed = False # Only allowed if no more rounds follow
+
+    def add_tally(self, tally: dict[str, int]):
+        """Add a tally of complete rounds to both running totals
+
+        Args:
+            tally (dict[str, int]): The number of times each round line occurs
+        """
+        self.standard_total += score_tally(tally, standard_round_scores)
+        self.second_total += score_tally(tally, second_round_scores)
+
+    def feed(self, chunk: str) -> tuple[int, int]:
+        """Feed an arbitrary chunk of the guide, which may start or end mid round
+
+        Args:
+            chunk (str): The next piece of the guide
+
+        Raises:
+            ValueError: If any complete line is not one of the nine round lines
+
+        Returns:
+            tuple[int, int]: The running totals under the standard and problem 2 rule sets
+        """
+        text: str = self.partial_round + chunk
+        end_of_complete: int = text.rfind("\n") + 1
+
+        # Hold back any blank lines, which are only allowed at the very end of the guide
+        while end_of_complete and (end_of_complete == 1 or text[end_of_complete - 2] == "\n"):
+            end_of_complete -= 1
+
+        self.partial_round = text[end_of_complete:]
+        self.add_tally(tally_rounds(text[:end_of_complete]))
+
+        return self.totals()
+
+    def feed_lines(self, lines: Iterable[str]) -> tuple[int, int]:
+        """Feed complete rounds one line at a time
+
+        Args:
+            lines (Iterable[str]): The rounds, with or without trailing newlines
+
+        Raises:
+            ValueError: If a line is not a round, or a round comes after a blank line
+
+        Returns:
+            tuple[int, int]: The running totals under the standard and problem 2 rule sets
+        """
+        for line in lines:
+            rnd: str = line.rstrip("\r\n")
+
+            if not rnd:
+                self.blank_line_fed = True
+                continue
+
+            if rnd not in standard_round_scores:
+                raise ValueError(f"{rnd!r} is not a round like 'A X'")
+            if self.blank_line_fed:
+                raise ValueError("blank lines are only allowed at the end of the guide")
+
+            self.standard_total += standard_round_scores[rnd]
+            self.second_total += second_round_scores[rnd]
+
+        return self.totals()
+
+    def finish(self) -> tuple[int, int]:
+        """Score any final round left without a trailing newline
+
+        Raises:
+            ValueError: If what is left is not a round
+
+        Returns:
+            tuple[int, int]: The final totals under the standard and problem 2 rule sets
+        """
+        self.add_tally(tally_rounds(self.partial_round))
+        self.partial_round = ""
+
+        return self.totals()
+
+    def totals(self) -> tuple[int, int]:
+        """Get the totals of every complete round fed so far
+
+        Returns:
+            tuple[int, int]: The totals under the standard and problem 2 rule sets
+        """
+        return self.standard_total, self.second_total
+
+def score_stream(stream: TextIO, chunk_size: int=65536) -> tuple[int, int]:
+    """Score a guide from a file or stdin under both rule sets, without staging it in memory
+
+    Args:
+        stream (TextIO): The open stream of the guide
+        chunk_size (int, optional): The number of characters to read at a time
+
+    Returns:
+        tuple[int, int]: The totals under the standard and problem 2 rule sets
+    """
+    scorer: GuideScorer = GuideScorer()
+
+    while chunk := stream.read(chunk_size):
+        scorer.feed(chunk)
+
+    return scorer.finish()
+
 def guided_total_score(guide: str, standard_rule_set: bool=True) -> int:
     """Calculate the total score the guide will net you
 
@@ -122,14 +330,117 @@ def guided_total_score(guide: str, standard_rule_set: bool=True) -> int:
 
     return total_points
 
+outcome_moves: dict[chr, dict] = {
+    'U': wins,  # You win   - play what beats them
+    'D': draws, # Draw      - play the same
+    'E': loses  # Enemy win - play what loses to them
+}
+
+def score_move_mapping(tally: dict[str, int], mapping: dict[chr, chr]) -> int:
+    """Score a tally with the second column read as your move
+
+    Args:
+        tally (dict[str, int]): The number of times each round line occurs
+        mapping (dict[chr, chr]): The move (X, Y or Z) each column letter stands for
+
+    Returns:
+        int: The total score
+    """
+    total: int = 0
+
+    for rnd, count in tally.items():
+        enemy_move: chr = rnd[0]
+        your_move: chr = mapping[rnd[-1]]
+        total += count * calculate_points(your_move, is_winner_you(enemy_move, your_move))
+
+    return total
+
+def score_outcome_mapping(tally: dict[str, int], mapping: dict[chr, chr]) -> int:
+    """Score a tally with the second column read as the outcome to aim for
+
+    Args:
+        tally (dict[str, int]): The number of times each round line occurs
+        mapping (dict[chr, chr]): The outcome (U, D or E) each column letter stands for
+
+    Returns:
+        int: The total score
+    """
+    total: int = 0
+
+    for rnd, count in tally.items():
+        enemy_move: chr = rnd[0]
+        your_move: chr = outcome_moves[mapping[rnd[-1]]][enemy_move]
+        total += count * calculate_points(your_move, is_winner_you(enemy_move, your_move))
+
+    return total
+
+def rank_mappings(guide: str) -> list[tuple[int, str, dict]]:
+    """Score every way of reading the second column, from one tally of the guide
+    Covers all 6 move permutations and all 6 outcome permutations,
+    so the cost after the tally does not depend on the size of the guide
+
+    Args:
+        guide (str): The guide as a raw string
+
+    Returns:
+        list[tuple[int, str, dict]]: (score, "moves" or "outcomes", column mapping),
+        highest score first
+    """
+    tally: dict[str, int] = tally_rounds(guide)
+    ranked: list = []
+
+    for moves in permutations("XYZ"):
+        mapping: dict[chr, chr] = dict(zip("XYZ", moves))
+        ranked.append((score_move_mapping(tally, mapping), "moves", mapping))
+
+    for outcomes in permutations("EDU"):
+        mapping: dict[chr, chr] = dict(zip("XYZ", outcomes))
+        ranked.append((score_outcome_mapping(tally, mapping), "outcomes", mapping))
+
+    ranked.sort(key=lambda scored: scored[0], reverse=True)
+
+    return ranked
+
+stages: dict[str, list] = { # What run.py --instrument times, per-round helpers are left out
+    "parse": ["get_rounds", "tally_rounds"],
+    "compute": ["score_move_mapping", "score_outcome_mapping"],
+    "aggregate": ["score_tally", "guided_total_score", "counted_total_score", "rank_mappings"],
+}
+
+def part_1(inp: str) -> int:
+    """Part 1 - the total score with the second column as your move
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The total score with the second column as your move
+    """
+    return counted_total_score(inp)
+
+def part_2(inp: str) -> int:
+    """Part 2 - the total score with the second column as the outcome
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The total score with the second column as the outcome
+    """
+    return counted_total_score(inp, False)
+
 def main():
     """Main function - Do logic and print total score
+    Pass "-" as the only argument to score a guide streamed in on stdin
     """
-    total_score: int = guided_total_score(read_input())
-    print(f"1: {total_score}")
-
-    total_score: int = guided_total_score(read_input(), False)
-    print(f"2: {total_score}")
+    if sys.argv[1:] == ["-"]:
+        standard_score, second_score = score_stream(sys.stdin)
+    else:
+        with open(input_path, "r", encoding="utf-8") as input_file:
+            standard_score, second_score = score_stream(input_file)
+
+    print(f"1: {standard_score}")
+    print(f"2: {second_score}")
 
 if __name__ == "__main__":
     main()
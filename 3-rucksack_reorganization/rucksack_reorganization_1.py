@@ -2,14 +2,27 @@
     https://adventofcode.com/2022/day/3
 """
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+import os
+import string
+import sys
+from collections.abc import Iterable, Iterator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
+
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
+
+    Args:
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
         str: A raw string of the inputs
     """
-    with open("3-rucksack_reorganization/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+    return load_input(path).text
 
 def split_rucksacks(inp: str) -> list:
     """Split the raw input string into a list of rucksacks
@@ -111,6 +124,174 @@ def calculate_priority(item: chr) -> int:
 
     return ord(item) - steps_down
 
+def build_item_bits() -> list:
+    """Build a byte to bit table where each item's bit position is its priority - 1
+
+    Returns:
+        list: The bit for every byte value (0 for bytes that are not items)
+    """
+    item_bits: list = [0] * 256
+
+    for item in string.ascii_letters:
+        item_bits[ord(item)] = 1 << (calculate_priority(item) - 1)
+
+    return item_bits
+
+item_bits: list = build_item_bits()
+
+def item_mask(items: bytes) -> int:
+    """Encode a compartment or rucksack as a 52 bit mask of the items it holds
+
+    Args:
+        items (bytes): The items as ASCII bytes, encoded once by the caller
+
+    Returns:
+        int: The mask with a bit set for each item type present
+    """
+    mask: int = 0
+
+    for byte in items:
+        mask |= item_bits[byte]
+
+    return mask
+
+def mask_priority(mask: int) -> int:
+    """Find the sum of priorities of every item in a mask
+    A single item, the usual case, is just the mask's bit length
+
+    Args:
+        mask (int): The item mask
+
+    Returns:
+        int: The sum of priorities (bit position + 1 of each set bit)
+    """
+    if not mask & (mask - 1):
+        return mask.bit_length()
+
+    total: int = 0
+
+    while mask:
+        lowest_bit: int = mask & -mask
+        total += lowest_bit.bit_length()
+        mask ^= lowest_bit
+
+    return total
+
+def is_ambiguous(mask: int) -> bool:
+    """Whether more than one item is shared
+
+    Args:
+        mask (int): The shared item mask
+
+    Returns:
+        bool: True if more than one bit is set
+    """
+    return mask & (mask - 1) != 0
+
+def compartment_priority_masked(rucksack_raw: str) -> tuple[int, list]:
+    """Find the priority sum of items in both compartments, using item masks
+
+    Args:
+        rucksack_raw (str): The raw string of rucksacks
+
+    Returns:
+        tuple[int, list]: The sum of priorities,
+        the indices of rucksacks with more than one item in both compartments
+    """
+    total: int = 0
+    ambiguous: list = []
+
+    # Encoded once, so each compartment is masked straight from its bytes
+    for index, rucksack in enumerate(rucksack_raw.encode().split(b"\n")):
+        middle_index: int = len(rucksack) // 2
+        shared: int = item_mask(rucksack[:middle_index]) & item_mask(rucksack[middle_index:])
+
+        if shared & (shared - 1): # More than one item, as is_ambiguous without the call
+            total += mask_priority(shared)
+            ambiguous.append(index)
+        else:
+            total += shared.bit_length() # One item, its priority is its bit position + 1
+
+    return total, ambiguous
+
+def group_priority_masked(rucksack_raw: str) -> tuple[int, list]:
+    """Find the priority sum of the identifiers common between groups of 3, using item masks
+
+    Args:
+        rucksack_raw (str): The raw string of rucksacks
+
+    Returns:
+        tuple[int, list]: The sum of priorities,
+        the indices of groups with more than one common identifier
+    """
+    total: int = 0
+    ambiguous: list = []
+    rucksacks: list = rucksack_raw.encode().split(b"\n")
+
+    for index in range(len(rucksacks) // 3):
+        first, second, third = rucksacks[index*3:index*3 + 3]
+        shared: int = item_mask(first) & item_mask(second) & item_mask(third)
+
+        if shared & (shared - 1): # More than one item, as is_ambiguous without the call
+            total += mask_priority(shared)
+            ambiguous.append(index)
+        else:
+            total += shared.bit_length() # One item, its priority is its bit position + 1
+
+    return total, ambiguous
+
+def iter_rucksacks(rucksack_raw: str) -> Iterator[str]:
+    """Lazily yield each rucksack, without splitting the whole input into a list
+
+    Args:
+        rucksack_raw (str): The raw string of rucksacks
+
+    Yields:
+        str: Each rucksack as a string
+    """
+    start: int = 0
+
+    while (end := rucksack_raw.find("\n", start)) != -1:
+        yield rucksack_raw[start:end]
+        start = end + 1
+
+    yield rucksack_raw[start:]
+
+def audit_rucksacks(rucksacks: Iterable[str], group_size: int=3) -> tuple[int, int]:
+    """Find both priority sums in one pass, holding at most one group's mask at a time
+    A final group with fewer than group_size rucksacks is ignored
+
+    Args:
+        rucksacks (Iterable[str]): Each rucksack as a string
+        group_size (int, optional): The number of rucksacks in each group
+
+    Returns:
+        tuple[int, int]: The priority sum of items in both compartments,
+        the priority sum of the identifiers common to each group
+    """
+    compartment_total: int = 0
+    group_total: int = 0
+
+    group_mask: int = 0
+    rucksacks_in_group: int = 0
+
+    for rucksack in rucksacks:
+        items: bytes = rucksack.encode()
+        middle_index: int = len(items) // 2
+        left_mask: int = item_mask(items[:middle_index])
+        right_mask: int = item_mask(items[middle_index:])
+        compartment_total += mask_priority(left_mask & right_mask)
+
+        rucksack_mask: int = left_mask | right_mask
+        group_mask = rucksack_mask if rucksacks_in_group == 0 else group_mask & rucksack_mask
+        rucksacks_in_group += 1
+
+        if rucksacks_in_group == group_size:
+            group_total += mask_priority(group_mask)
+            rucksacks_in_group = 0
+
+    return compartment_total, group_total
+
 def priority_sum(items: list) -> int:
     """Find the sum of priorities of a list of items
 
@@ -127,16 +308,47 @@ def priority_sum(items: list) -> int:
 
     return total
 
+stages: dict[str, list] = { # What run.py --instrument times, per-item helpers are left out
+    "parse": ["split_rucksacks", "split_groups", "iter_rucksacks"],
+    "compute": [
+        "items_in_both_compartments", "identifiers_common_between_groups",
+        "compartment_priority_masked", "group_priority_masked", "audit_rucksacks"
+    ],
+    "aggregate": ["priority_sum"],
+}
+
+def part_1(inp: str) -> int:
+    """Part 1 - the priority sum of items in both compartments
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The priority sum of items in both compartments
+    """
+    return compartment_priority_masked(inp)[0]
+
+def part_2(inp: str) -> int:
+    """Part 2 - the priority sum of each group's badge
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The priority sum of each group's badge
+    """
+    return group_priority_masked(inp)[0]
+
 def main():
     """Main function - read input and do logic
     """
-    items_in_both: list = items_in_both_compartments(read_input())
-    total_priority = priority_sum(items_in_both)
-    print(f"1: {total_priority}")
+    with open(input_path, "r", encoding="utf-8") as input_file:
+        compartment_total, group_total = audit_rucksacks(
+            line.rstrip("\n") for line in input_file
+        )
 
-    group_identifiers: list = identifiers_common_between_groups(read_input())
-    total_priority = priority_sum(group_identifiers)
-    print(f"2: {total_priority}")
+    print(f"1: {compartment_total}")
+    print(f"2: {group_total}")
 
 if __name__ == "__main__":
     main()
@@ -2,29 +2,47 @@
     https://adventofcode.com/2022/day/4
 """
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+import bisect
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
+
+try:
+    import numpy as np
+except ImportError: # Only needed for the numpy backend
+    np = None
+
+separators_to_spaces: dict = str.maketrans(",-", "  ")
+
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
+
+    Args:
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
         str: A raw string of the inputs
     """
-    with open("4-camp_cleanup/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+    return load_input(path).text
 
 class Elf:
     """A class to hold attributes about an elf
+    Only the bounds are stored, so an elf costs the same whatever the width of its range
     """
+    __slots__ = ("min", "max")
+
     min: int
     max: int
 
-    range: set
-
     def __init__(self, min_max: tuple[int, int]):
         self.min = min_max[0]
         self.max = min_max[1]
 
-        self.range = set(range(self.min, self.max+1))
-
 def split_pairs(inp: str) -> list:
     """Splits each of the entires into their pair groups
 
@@ -60,50 +78,49 @@ def split_min_and_max(inp: str) -> tuple[int, int]:
     values: list = inp.split("-")
     return int(values[0]), int(values[1])
 
-def is_intersect(reoccuring: list) -> bool:
-    """Determine whether the reoccuring pairs intersect at all
+def is_intersect(elf1: Elf, elf2: Elf) -> bool:
+    """Determine whether the two elf's ranges intersect at all
 
     Args:
-        reoccuring (list): The reoccuring pairs
+        elf1 (Elf): The first elf's object
+        elf2 (Elf): The second elf's object
 
     Returns:
-        bool: Whether they intersect (reoccuring length != 0)
+        bool: Whether they intersect (each starts before the other ends)
     """
-    return len(reoccuring) != 0
+    return elf1.min <= elf2.max and elf2.min <= elf1.max
 
-def is_fully_contain(reoccuring: list, elf1: Elf, elf2: Elf) -> bool:
-    """Logic for whether the two elf's ranges intersect
-    If first item and last item of range == elf1 min and max
+def is_fully_contain(elf1: Elf, elf2: Elf) -> bool:
+    """Logic for whether one elf's range wholly contains the other
+    If elf1's bounds lie within elf2's
     or
-    If first item and last item of range == elf 2 min and max
-    We know that they must wholly contain eachother
+    If elf2's bounds lie within elf1's
 
     Args:
-        reoccuring (list): A list of values that appear in both elves ranges
         elf1 (Elf): The first elf's object
         elf2 (Elf): The second elf's object
 
     Returns:
         bool: A boolean to indicate whether one of the elf's range wholly contains the other
     """
-    reoccuring.sort()
-    if len(reoccuring) == 0:
-        return False
-
     return (
-        (reoccuring[0] == elf1.min and reoccuring[-1] == elf1.max) or
-        (reoccuring[0] == elf2.min and reoccuring[-1] == elf2.max)
+        (elf2.min <= elf1.min and elf1.max <= elf2.max) or
+        (elf1.min <= elf2.min and elf2.max <= elf1.max)
     )
 
-def count_fully_contain_and_intersect(inp: str) -> tuple[int, int]:
+def count_fully_contain_and_intersect(inp: str, backend: str="python") -> tuple[int, int]:
     """Count the total number of pairs that fully contain each other, and intersect at all
 
     Args:
         inp (str): The raw input
+        backend (str, optional): "python" to walk each pair, or "numpy" to classify them in bulk
 
     Returns:
         tuple[int, int]: The count that fully contain each other, the count that intersect at all
     """
+    if backend == "numpy":
+        return count_fully_contain_and_intersect_numpy(inp)
+
     pairs = split_pairs(inp)
 
     total_fully_contain: int = 0
@@ -115,14 +132,195 @@ def count_fully_contain_and_intersect(inp: str) -> tuple[int, int]:
         elf1: Elf = Elf(split_min_and_max(left))
         elf2: Elf = Elf(split_min_and_max(right))
 
-        elf_set: set = set(elf1.range & elf2.range)
-
-        if is_intersect(elf_set):
+        if is_intersect(elf1, elf2):
             total_intersect += 1
-            total_fully_contain += 1 if is_fully_contain(list(elf_set), elf1, elf2) else 0
+            total_fully_contain += 1 if is_fully_contain(elf1, elf2) else 0
 
     return total_fully_contain, total_intersect
 
+def parse_pairs_array(inp: str) -> "np.ndarray":
+    """Parse every pair into one integer array in a single pass
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        np.ndarray: An (n, 4) array of left min, left max, right min, right max
+    """
+    if np is None:
+        raise ImportError("numpy is required for the numpy backend")
+
+    numbers: str = inp.translate(separators_to_spaces)
+
+    return np.fromstring(numbers, dtype=np.int64, sep=" ").reshape(-1, 4)
+
+def count_fully_contain_and_intersect_numpy(inp: str) -> tuple[int, int]:
+    """Count the pairs that fully contain each other, and intersect at all, with numpy
+    Gives the same result as count_fully_contain_and_intersect
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        tuple[int, int]: The count that fully contain each other, the count that intersect at all
+    """
+    pairs: np.ndarray = parse_pairs_array(inp)
+    left_min, left_max, right_min, right_max = pairs.T
+
+    fully_contain: np.ndarray = (
+        ((right_min <= left_min) & (left_max <= right_max)) |
+        ((left_min <= right_min) & (right_max <= left_max))
+    )
+    intersect: np.ndarray = (left_min <= right_max) & (right_min <= left_max)
+
+    return int(np.count_nonzero(fully_contain)), int(np.count_nonzero(intersect))
+
+class OverlapIndex:
+    """An index over every elf's assignment for camp wide overlap queries
+    Elves are sorted by their minimum, with a tree of maximum section ends over that order
+    """
+    starts: list
+    ends: list
+    elf_order: list
+
+    sorted_ends: list
+    max_end_tree: list
+    leaf_count: int
+
+    most_on_a_section: int
+    overlapping_pairs: int
+
+    def __init__(self, bounds: list[tuple[int, int]]):
+        self.elf_order = sorted(range(len(bounds)), key=lambda elf: bounds[elf][0])
+        self.starts = [bounds[elf][0] for elf in self.elf_order]
+        self.ends = [bounds[elf][1] for elf in self.elf_order]
+        self.sorted_ends = sorted(self.ends)
+
+        self.leaf_count = 1
+        while self.leaf_count < len(bounds):
+            self.leaf_count *= 2
+
+        # Leaves hold each elf's max, parents the largest max below them
+        self.max_end_tree = [-1] * (2 * self.leaf_count)
+        self.max_end_tree[self.leaf_count:self.leaf_count + len(self.ends)] = self.ends
+
+        for node in range(self.leaf_count - 1, 0, -1):
+            self.max_end_tree[node] = max(self.max_end_tree[2*node], self.max_end_tree[2*node + 1])
+
+        # Both camp wide answers come from one sweep of the starts, done once here - O(n log n)
+        # A pair is disjoint only if one ends before the other starts, so those are counted
+        self.most_on_a_section = 0
+        disjoint: int = 0
+
+        for position, start in enumerate(self.starts):
+            finished: int = bisect.bisect_left(self.sorted_ends, start) # Ended before this start
+            disjoint += finished
+            self.most_on_a_section = max(self.most_on_a_section, position + 1 - finished)
+
+        self.overlapping_pairs = len(bounds) * (len(bounds) - 1) // 2 - disjoint
+
+    def overlapping(self, section_min: int, section_max: int) -> list:
+        """Find every elf assigned to any section in a range - O((k + 1) log n)
+
+        Args:
+            section_min (int): The first section of the range
+            section_max (int): The last section of the range
+
+        Returns:
+            list: The indices of the elves that overlap the range, in order
+        """
+        candidates: int = bisect.bisect_right(self.starts, section_max) # Start before the end
+        found: list = []
+
+        stack: list = [(1, 0, self.leaf_count)] # Node, first position, past last position
+
+        while stack:
+            node, first, past_last = stack.pop()
+
+            if first >= candidates or self.max_end_tree[node] < section_min:
+                continue # Nothing below this node ends inside the range
+
+            if node >= self.leaf_count:
+                found.append(self.elf_order[first])
+                continue
+
+            middle: int = (first + past_last) // 2
+            stack.append((2*node + 1, middle, past_last))
+            stack.append((2*node, first, middle))
+
+        found.sort()
+
+        return found
+
+    def max_elves_on_a_section(self) -> int:
+        """Find the largest number of elves assigned to any one section
+        Worked out when the index was built - O(1)
+
+        Returns:
+            int: The maximum number of elves sharing a section (0 if there are no elves)
+        """
+        return self.most_on_a_section
+
+    def count_overlapping_pairs(self) -> int:
+        """Count every pair of elves in the camp whose assignments overlap
+        Worked out when the index was built - O(1)
+
+        Returns:
+            int: The number of overlapping pairs
+        """
+        return self.overlapping_pairs
+
+def build_overlap_index(inp: str) -> OverlapIndex:
+    """Build an overlap index over every elf in the input
+    The left elf of pair i is elf 2i and the right elf is elf 2i + 1
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        OverlapIndex: The index over all of the elves
+    """
+    bounds: list = []
+
+    for pair in split_pairs(inp):
+        left, right = split_elves(pair)
+
+        bounds.append(split_min_and_max(left))
+        bounds.append(split_min_and_max(right))
+
+    return OverlapIndex(bounds)
+
+stages: dict[str, list] = { # What run.py --instrument times, per-pair helpers are left out
+    "parse": ["split_pairs", "parse_pairs_array"],
+    "compute": [
+        "count_fully_contain_and_intersect", "count_fully_contain_and_intersect_numpy",
+        "build_overlap_index"
+    ],
+    "aggregate": [],
+}
+
+def part_1(inp: str) -> int:
+    """Part 1 - the number of pairs where one range fully contains the other
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The number of pairs where one range fully contains the other
+    """
+    return count_fully_contain_and_intersect(inp)[0]
+
+def part_2(inp: str) -> int:
+    """Part 2 - the number of pairs that overlap at all
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The number of pairs that overlap at all
+    """
+    return count_fully_contain_and_intersect(inp)[1]
+
 def main():
     """Main function - do logic
     """
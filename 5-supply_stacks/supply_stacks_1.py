@@ -2,108 +2,143 @@
     https://adventofcode.com/2022/day/5
 """
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+import os
+import random
+import re
+import sys
+from array import array
+from collections.abc import Iterator
+from itertools import chain
 
-    Returns:
-        str: A raw string of the inputs
-    """
-    with open("5-supply_stacks/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
 
-def split_lines(inp: str) -> list:
-    """Split the raw input into lines
+instruction_pattern: re.Pattern = re.compile(r"^move (\d+) from (\d+) to (\d+)$", re.MULTILINE)
+
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
 
     Args:
-        inp (str): The raw input
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
-        list: Each line of the input
+        str: A raw string of the inputs
     """
-    return inp.split("\n")
+    return load_input(path).text
 
-def find_blank_line_index(lines: list) -> int:
-    """Find the index of the blank line - thus the index of the instruction start is 1 further
+def split_drawing_and_instructions(inp: str) -> tuple[list, str]:
+    """Split the input into the rows of the crate drawing and the block of instructions
 
     Args:
-        lines (list): The lines of the input
+        inp (str): The raw input
 
     Returns:
-        int: The index of the blank line
+        tuple[list, str]: The drawing rows (without the tower numbers), the raw instructions
     """
-    return lines.index("")
+    drawing, _, instructions = inp.partition("\n\n")
 
-def split_instructions_and_current_state(lines: list) -> tuple[list, list]:
-    """Split the input into the instructions and the current state of the towers
+    return drawing.split("\n")[:-1], instructions
+
+def populate_towers(current_state: list) -> list:
+    """Populate the towers based on the current state
+    Each crate's letter sits at a fixed column offset (1, 5, 9, ...) so rows are read in place
 
     Args:
-        lines (list): The lines of the input
+        current_state (list): The current state in lines as a list
 
     Returns:
-        tuple[list, list]: First list - current state, Second list - instructions
+        list: The towers as a 2D list
+        1st dimention - tower num
+        2nd dimention - crates on the tower
     """
-    start_of_instructions: int = find_blank_line_index(lines)
+    tower_count: int = max((len(row[1::4]) for row in current_state), default=0)
+    outp: list = [[] for _ in range(tower_count)]
 
-    return lines[:start_of_instructions], lines[start_of_instructions+1:]
+    for state_row in reversed(current_state): # Bottom row first
+        for tower, offset in enumerate(range(1, len(state_row), 4)):
+            if state_row[offset] != " ":
+                outp[tower].append(state_row[offset-1:offset+2])
 
-def split_row_into_crates(row: str) -> list:
-    """Splits the row into sections of 4 (its crates)
+    return outp
+
+def instruction_components(instruction: str) -> tuple[int, int, int]:
+    """Split each instruction into its components
 
     Args:
-        row (str): The row to split
+        instruction (str): The instruction itself
+
+    Raises:
+        ValueError: If the line is not exactly one instruction
 
     Returns:
-        list: A list of crates in that row (index = tower)
+        tuple[int, int, int]: Three integers, quantity, move from, move to
     """
-    return [row[y-4:y] for y in range(4, len(row)+4,4)]
+    match: re.Match = instruction_pattern.fullmatch(instruction)
 
-def populate_towers(current_state: list) -> list:
-    """Populate the towers based on the current state
+    if not match:
+        raise ValueError(f"{instruction!r} is not an instruction")
+
+    quantity, where_from, where_to = match.groups()
+
+    return int(quantity), int(where_from), int(where_to)
+
+def parse_instructions(instructions_raw: str) -> array:
+    """Decode every instruction in one regex pass over the whole block
+    The pattern only matches whole lines, so every line must be exactly one instruction
+    Whitespace at the end of the block is ignored, any other non-instruction line is an error
 
     Args:
-        current_state (list): The current state in lines as a list
+        instructions_raw (str): The raw block of instructions
+
+    Raises:
+        ValueError: If any line is not an instruction
 
     Returns:
-        list: The towers as a 2D list
-        1st dimention - tower num
-        2nd dimention - crates on the tower
+        array: Flat (quantity, move from, move to) triples as an array of ints
     """
-    outp: list = []
-    counter: int
+    instructions: array = array(
+        "i", map(int, chain.from_iterable(instruction_pattern.findall(instructions_raw)))
+    )
 
-    current_state.reverse()
+    end: int = len(instructions_raw)
+    while end and instructions_raw[end - 1].isspace():
+        end -= 1
 
-    first_run: bool = True
+    lines: int = instructions_raw.count("\n", 0, end) + 1 if end else 0
 
-    for state_row in current_state:
-        crates: list = split_row_into_crates(state_row)
+    if len(instructions) // 3 != lines:
+        raise ValueError(f"only {len(instructions) // 3} of {lines} lines are instructions")
 
-        outp = [[] for _ in range(len(crates))] if first_run else outp
-        first_run = False
+    return instructions
 
-        counter = 0
-        for crate in crates:
-            cleaned_chunk = crate.replace(" ", "")
+def iter_instructions(instructions: array) -> Iterator[tuple[int, int, int]]:
+    """Walk the triples of a parsed instruction array
 
-            if cleaned_chunk != "":
-                outp[counter].append(cleaned_chunk)
+    Args:
+        instructions (array): Flat (quantity, move from, move to) triples
 
-            counter += 1
+    Returns:
+        Iterator[tuple[int, int, int]]: Each quantity, move from, move to
+    """
+    values: Iterator[int] = iter(instructions)
 
-    return outp
+    return zip(values, values, values)
 
-def instruction_components(instruction: str) -> tuple[int, int, int]:
-    """Split each instruction into its components
+def parse_input(inp: str) -> tuple[list, array]:
+    """Parse the raw input into the starting towers and the instructions
 
     Args:
-        instruction (str): The instruction itself
+        inp (str): The raw input
 
     Returns:
-        tuple[int, int, int]: Three integers, quantity, move from, move to
+        tuple[list, array]: The starting towers, the flat instruction triples
     """
-    new_instruction: str = instruction.replace("move", "").replace("from", "").replace("to", "")
+    current_state, instructions_raw = split_drawing_and_instructions(inp)
 
-    return [int(x) for x in new_instruction.split("  ")]
+    return populate_towers(current_state), parse_instructions(instructions_raw)
 
 def perform_move_mode_1(quantity: int, where_from: int, where_to: int, towers: list) -> list:
     """Perform move with CrateMover 9000 which can only move 1 crate at a time
@@ -179,15 +214,9 @@ def compute_rearrangement(inp: str, move_mode: int=0) -> list:
     Returns:
         list: The final state of the towers
     """
-    lines: list = split_lines(inp)
-
-    current_state, instructions = split_instructions_and_current_state(lines)
-    current_state.pop()
+    towers, instructions = parse_input(inp)
 
-    towers: list = populate_towers(current_state)
-
-    for inst in instructions:
-        quantity, where_from, where_to = instruction_components(inst)
+    for quantity, where_from, where_to in iter_instructions(instructions):
         where_from -= 1
         where_to -= 1
 
@@ -195,6 +224,211 @@ def compute_rearrangement(inp: str, move_mode: int=0) -> list:
 
     return towers
 
+class CrateSegment:
+    """A node in a tower's implicit treap, whose in-order traversal is the tower bottom to top
+    A flipped node has its whole subtree reversed, pushed down to its children lazily
+    """
+    __slots__ = ("crate", "priority", "size", "left", "right", "flipped")
+
+    crate: str
+    priority: float
+    size: int
+    left: "CrateSegment"
+    right: "CrateSegment"
+    flipped: bool
+
+    def __init__(self, crate: str):
+        self.crate = crate
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.flipped = False
+
+def segment_size(segment: CrateSegment) -> int:
+    """The number of crates in a segment
+
+    Args:
+        segment (CrateSegment): The segment (None if empty)
+
+    Returns:
+        int: The number of crates in it
+    """
+    return segment.size if segment else 0
+
+def push_flip(segment: CrateSegment):
+    """Push a pending reversal from a segment down to its children
+
+    Args:
+        segment (CrateSegment): The segment to push down
+    """
+    if segment.flipped:
+        segment.left, segment.right = segment.right, segment.left
+
+        for child in (segment.left, segment.right):
+            if child:
+                child.flipped = not child.flipped
+
+        segment.flipped = False
+
+def merge_segments(bottom: CrateSegment, top: CrateSegment) -> CrateSegment:
+    """Stack one segment on top of another - O(log n)
+
+    Args:
+        bottom (CrateSegment): The lower segment
+        top (CrateSegment): The segment to put on top of it
+
+    Returns:
+        CrateSegment: The combined segment
+    """
+    if not bottom or not top:
+        return bottom or top
+
+    if bottom.priority > top.priority:
+        push_flip(bottom)
+        bottom.right = merge_segments(bottom.right, top)
+        bottom.size = segment_size(bottom.left) + segment_size(bottom.right) + 1
+        return bottom
+
+    push_flip(top)
+    top.left = merge_segments(bottom, top.left)
+    top.size = segment_size(top.left) + segment_size(top.right) + 1
+    return top
+
+def split_segment(segment: CrateSegment, count: int) -> tuple[CrateSegment, CrateSegment]:
+    """Split a segment after its bottom count crates - O(log n)
+
+    Args:
+        segment (CrateSegment): The segment to split
+        count (int): The number of crates to keep in the lower part
+
+    Returns:
+        tuple[CrateSegment, CrateSegment]: The bottom count crates, the rest above them
+    """
+    if not segment:
+        return None, None
+
+    push_flip(segment)
+
+    if segment_size(segment.left) < count:
+        lower, upper = split_segment(segment.right, count - segment_size(segment.left) - 1)
+        segment.right = lower
+        segment.size = segment_size(segment.left) + segment_size(segment.right) + 1
+        return segment, upper
+
+    lower, upper = split_segment(segment.left, count)
+    segment.left = upper
+    segment.size = segment_size(segment.left) + segment_size(segment.right) + 1
+    return lower, segment
+
+class CrateTower:
+    """A tower of crates where moving any number of crates costs O(log n)
+    """
+    root: CrateSegment
+
+    def __init__(self, crates: list):
+        self.root = None
+
+        for crate in crates:
+            self.root = merge_segments(self.root, CrateSegment(crate))
+
+    def __len__(self) -> int:
+        return segment_size(self.root)
+
+    def take_top(self, quantity: int) -> CrateSegment:
+        """Remove the top crates as one segment
+
+        Args:
+            quantity (int): The number of crates to take
+
+        Raises:
+            ValueError: If the tower has fewer than quantity crates
+
+        Returns:
+            CrateSegment: The crates taken, bottom to top
+        """
+        if quantity > len(self):
+            raise ValueError(f"can't take {quantity} crates from a tower of {len(self)}")
+
+        self.root, taken = split_segment(self.root, len(self) - quantity)
+
+        return taken
+
+    def put_on_top(self, segment: CrateSegment, reverse: bool):
+        """Put a segment of crates on top of the tower
+
+        Args:
+            segment (CrateSegment): The crates to add
+            reverse (bool): Whether the crates land in reverse order (moved one at a time)
+        """
+        if segment and reverse:
+            segment.flipped = not segment.flipped
+
+        self.root = merge_segments(self.root, segment)
+
+    def to_list(self) -> list:
+        """List the crates in the tower
+
+        Returns:
+            list: The crates from bottom to top
+        """
+        crates: list = []
+        stack: list = []
+        segment: CrateSegment = self.root
+
+        while stack or segment:
+            if segment:
+                push_flip(segment)
+                stack.append(segment)
+                segment = segment.left
+            else:
+                segment = stack.pop()
+                crates.append(segment.crate)
+                segment = segment.right
+
+        return crates
+
+def perform_move_segment(
+    quantity: int,
+    where_from: int,
+    where_to: int,
+    towers: list,
+    move_mode: int) -> list:
+    """Perform a move as one segment splice, reversed for the CrateMover 9000
+
+    Args:
+        quantity (int): The number of crates to move
+        where_from (int): from position where_from
+        where_to (int): to position where_to
+        towers (list): in towers, as CrateTowers
+        move_mode (int): The move mode to use
+
+    Returns:
+        list: The final state of the towers after the move is complete
+    """
+    towers[where_to].put_on_top(towers[where_from].take_top(quantity), move_mode == 0)
+
+    return towers
+
+def compute_rearrangement_segments(inp: str, move_mode: int=0) -> list:
+    """Work out the final state of the towers, splicing whole segments for each move
+    Gives the same result as compute_rearrangement at O(log n) per instruction
+
+    Args:
+        inp (str): The raw input
+        move_mode (int, optional): The move mode to use
+
+    Returns:
+        list: The final state of the towers
+    """
+    starting_towers, instructions = parse_input(inp)
+    towers: list = [CrateTower(tower) for tower in starting_towers]
+
+    for quantity, where_from, where_to in iter_instructions(instructions):
+        towers = perform_move_segment(quantity, where_from - 1, where_to - 1, towers, move_mode)
+
+    return [tower.to_list() for tower in towers]
+
 def find_message(towers: list) -> str:
     """Turn the towers final state into the flag
 
@@ -211,14 +445,243 @@ def find_message(towers: list) -> str:
 
     return outp
 
+def find_message_reverse(inp: str, move_mode: int=0) -> str:
+    """Find the flag without simulating the crates, by tracing each final top crate backwards
+    Walks the instructions in reverse, following where each tower's top crate came from,
+    then looks those crates up in the starting towers - O(instructions * towers)
+
+    Args:
+        inp (str): The raw input
+        move_mode (int, optional): The move mode to use
+
+    Raises:
+        ValueError: If a move takes more crates than its tower holds
+
+    Returns:
+        str: The flag for AOC (empty towers are skipped)
+    """
+    towers, instructions = parse_input(inp)
+    moves: list = list(iter_instructions(instructions))
+
+    heights: list = [len(tower) for tower in towers]
+    for quantity, where_from, where_to in moves:
+        if quantity > heights[where_from - 1]:
+            raise ValueError(
+                f"can't take {quantity} crates from a tower of {heights[where_from - 1]}"
+            )
+
+        heights[where_from - 1] -= quantity
+        heights[where_to - 1] += quantity
+
+    # Where each final top crate is, as (tower, height), working back to the start
+    tracked: list = [(tower, heights[tower] - 1) for tower in range(len(towers))]
+
+    for quantity, where_from, where_to in reversed(moves):
+        where_from -= 1
+        where_to -= 1
+
+        # Undo the move so heights are as they were before it
+        heights[where_to] -= quantity
+        heights[where_from] += quantity
+
+        for index, (tower, height) in enumerate(tracked):
+            if tower == where_to and height >= heights[where_to]: # Crate arrived in this move
+                offset: int = height - heights[where_to]
+                from_height: int = heights[where_from] - quantity + offset if move_mode == 1 \
+                    else heights[where_from] - 1 - offset
+
+                tracked[index] = (where_from, from_height)
+
+    outp: str = ""
+
+    for tower, height in tracked:
+        if height >= 0:
+            outp += towers[tower][height].replace("[", "").replace("]", "")
+
+    return outp
+
+def splice_move(
+    quantity: int,
+    where_from: int,
+    where_to: int,
+    towers: list,
+    move_mode: int) -> list:
+    """Perform a move by slicing the moved crates off in one go
+
+    Args:
+        quantity (int): The number of crates to move
+        where_from (int): from position where_from
+        where_to (int): to position where_to
+        towers (list): in towers
+        move_mode (int): The move mode to use
+
+    Raises:
+        ValueError: If the tower has fewer than quantity crates
+
+    Returns:
+        list: The final state of the towers after the move is complete
+    """
+    from_tower: list = towers[where_from]
+    split_at: int = len(from_tower) - quantity
+
+    if split_at < 0:
+        raise ValueError(f"can't take {quantity} crates from a tower of {len(from_tower)}")
+
+    moved: list = from_tower[split_at:]
+    del from_tower[split_at:]
+
+    towers[where_to].extend(reversed(moved) if move_mode == 0 else moved)
+
+    return towers
+
+class CraneSession:
+    """A crane simulation that snapshots the towers every checkpoint_interval instructions,
+    so the tops after any instruction can be found by replaying from the nearest snapshot
+    """
+    move_mode: int
+    checkpoint_interval: int
+
+    instructions: array
+    towers: list
+    checkpoints: list
+
+    partial_instruction: str
+
+    def __init__(self, starting_towers: list, move_mode: int=0, checkpoint_interval: int=1000):
+        self.move_mode = move_mode
+        self.checkpoint_interval = checkpoint_interval
+
+        self.instructions = array("i")
+        self.partial_instruction = "" # Instruction cut off at the end of the last block
+        self.towers = [[crate[1] for crate in tower] for tower in starting_towers] # Letters only
+        self.checkpoints = [self.snapshot()] # checkpoints[n] - after n * interval instructions
+
+    def __len__(self) -> int:
+        return len(self.instructions) // 3
+
+    def snapshot(self) -> tuple:
+        """Take a compact copy of the current towers
+
+        Returns:
+            tuple: Each tower as a string of crate letters, bottom to top
+        """
+        return tuple("".join(tower) for tower in self.towers)
+
+    def extend(self, instructions: array):
+        """Run new instructions on from the current state, without replaying earlier ones
+
+        Args:
+            instructions (array): Flat (quantity, move from, move to) triples
+        """
+        for quantity, where_from, where_to in iter_instructions(instructions):
+            splice_move(quantity, where_from - 1, where_to - 1, self.towers, self.move_mode)
+            self.instructions.extend((quantity, where_from, where_to))
+
+            if len(self) % self.checkpoint_interval == 0:
+                self.checkpoints.append(self.snapshot())
+
+    def append(self, instructions_raw: str):
+        """Parse and run new instructions on from the current state
+        The block may end mid instruction, the rest of which is expected in the next block
+
+        Args:
+            instructions_raw (str): A raw block of instructions
+
+        Raises:
+            ValueError: If any complete line is not an instruction
+        """
+        text: str = self.partial_instruction + instructions_raw
+        end_of_complete: int = text.rfind("\n") + 1
+
+        # Parsed before any state changes, so a bad block leaves the session as it was
+        instructions: array = parse_instructions(text[:end_of_complete])
+
+        self.partial_instruction = text[end_of_complete:]
+        self.extend(instructions)
+
+    def finish(self):
+        """Run any final instruction left without a trailing newline
+
+        Raises:
+            ValueError: If what is left is not an instruction
+        """
+        self.extend(parse_instructions(self.partial_instruction))
+        self.partial_instruction = ""
+
+    def tops_after(self, instruction_count: int) -> str:
+        """Find the flag as it was after a number of instructions
+        Restores the nearest earlier snapshot and replays at most checkpoint_interval instructions
+
+        Args:
+            instruction_count (int): The number of instructions run (0 for the start)
+
+        Raises:
+            IndexError: If fewer than instruction_count instructions have been run
+
+        Returns:
+            str: The top crate of each tower at that point (empty towers are skipped)
+        """
+        if not 0 <= instruction_count <= len(self):
+            raise IndexError(f"only {len(self)} instructions have been run")
+
+        checkpoint: int = instruction_count // self.checkpoint_interval
+        towers: list = [list(tower) for tower in self.checkpoints[checkpoint]]
+
+        replay: array = self.instructions[
+            checkpoint * self.checkpoint_interval * 3:instruction_count * 3
+        ]
+        for quantity, where_from, where_to in iter_instructions(replay):
+            splice_move(quantity, where_from - 1, where_to - 1, towers, self.move_mode)
+
+        return "".join(tower[-1] for tower in towers if tower)
+
+    def tops(self) -> str:
+        """Find the flag for the current state
+
+        Returns:
+            str: The top crate of each tower (empty towers are skipped)
+        """
+        return "".join(tower[-1] for tower in self.towers if tower)
+
+stages: dict[str, list] = { # What run.py --instrument times, per-move helpers are left out
+    "parse": [
+        "split_drawing_and_instructions", "populate_towers", "parse_instructions", "parse_input"
+    ],
+    "compute": ["compute_rearrangement", "compute_rearrangement_segments", "find_message_reverse"],
+    "aggregate": ["find_message"],
+}
+
+def part_1(inp: str) -> str:
+    """Part 1 - the top crates after moving with the CrateMover 9000
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        str: The top crates after moving with the CrateMover 9000
+    """
+    return find_message_reverse(inp)
+
+def part_2(inp: str) -> str:
+    """Part 2 - the top crates after moving with the CrateMover 9001
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        str: The top crates after moving with the CrateMover 9001
+    """
+    return find_message_reverse(inp, 1)
+
 def main():
     """Main function - do logic
     """
-    towers: list = compute_rearrangement(read_input())
-    print(f"1: {find_message(towers)}")
+    towers, instructions = parse_input(read_input())
 
-    towers: list = compute_rearrangement(read_input(), 1)
-    print(f"2: {find_message(towers)}")
+    for move_mode in (0, 1):
+        session: CraneSession = CraneSession(towers, move_mode)
+        session.extend(instructions)
+        print(f"{move_mode + 1}: {session.tops()}")
 
 if __name__ == "__main__":
     main()
@@ -2,14 +2,80 @@
     https://adventofcode.com/2022/day/6
 """
 
-def read_input() -> str:
-    """Read the inputs from inputs.txt
+import asyncio
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from typing import Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For shared_input
+
+from shared_input import load_input
+
+input_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+def read_input(path: str=input_path) -> str:
+    """Read the inputs from inputs.txt, through the shared memory-mapped cache
+
+    Args:
+        path (str, optional): The input file to read, defaults to this day's input.txt
 
     Returns:
         str: A raw string of the inputs
     """
-    with open("6-tuning_trouble/input.txt", "r", encoding="utf-8") as input_file:
-        return input_file.read()
+    return load_input(path).text
+
+class MarkerDetector:
+    """Find a marker in a datastream fed in chunks, keeping the window across chunk boundaries
+    Chunks may be str or bytes, but one stream should not mix the two
+    """
+    unique_chars_required: int
+    marker: int
+
+    position: int
+    window_start: int
+    last_seen: dict
+
+    def __init__(self, unique_chars_required: int):
+        self.unique_chars_required = unique_chars_required
+        self.marker = -1 # Not found yet
+
+        self.position = 0 # Characters seen so far
+        self.window_start = 0
+        self.last_seen = {}
+
+    def feed(self, chunk: Union[str, bytes]) -> int:
+        """Feed the next chunk of the datastream
+        Single pass - the window start jumps past the last sighting of any repeated character
+
+        Args:
+            chunk (Union[str, bytes]): The next piece of the datastream
+
+        Returns:
+            int: The index of the final item in the marker, as soon as it has been found (else -1)
+        """
+        if self.marker != -1:
+            return self.marker
+
+        last_seen: dict = self.last_seen
+        window_start: int = self.window_start
+
+        for index, char in enumerate(chunk, self.position):
+            previous: int = last_seen.get(char, -1)
+            if previous >= window_start: # Repeat inside the window
+                window_start = previous + 1
+
+            last_seen[char] = index
+
+            if index - window_start + 1 == self.unique_chars_required:
+                self.marker = index + 1 # Final value
+                break
+
+        self.position += len(chunk)
+        self.window_start = window_start
+
+        return self.marker
 
 def find_start_of_x(recieved_data: str, unique_chars_required: int) -> int:
     """Find the start of a marker in a string based on x unique chars
@@ -19,21 +85,78 @@ def find_start_of_x(recieved_data: str, unique_chars_required: int) -> int:
         unique_chars_required (int): The under of unique characters required to be correct
 
     Returns:
-        int: The index of the final item in the location found
+        int: The index of the final item in the location found (-1 if there is none)
     """
-    window: list = [None, None, None, None]
+    return MarkerDetector(unique_chars_required).feed(recieved_data)
+
+def find_markers(
+    recieved_data: Union[str, bytes],
+    window_sizes: Iterable[int],
+    all_occurrences: bool=False) -> dict:
+    """Find markers of several sizes in one pass over the data
+    Every size shares the length of the run of distinct characters ending at each index
 
-    for start_window_index in range(len(recieved_data)-unique_chars_required):
-        window = [
-            recieved_data[start_window_index+index] for index in range(unique_chars_required)
-        ]
+    Args:
+        recieved_data (Union[str, bytes]): The raw input data
+        window_sizes (Iterable[int]): The numbers of unique characters each marker requires
+        all_occurrences (bool, optional): Find every marker position rather than just the first
 
-        unique: set = set(window)
+    Returns:
+        dict: For each size, the index of the final item in its first marker (-1 if none),
+        or an array of the final item index of every marker when all_occurrences is set
+    """
+    sizes: list = sorted(set(window_sizes))
+    markers: dict = {size: array("q") for size in sizes} if all_occurrences \
+        else {size: -1 for size in sizes}
+
+    next_size: int = 0 # Sizes are found smallest first as the run only grows 1 at a time
+    last_seen: dict = {}
+    window_start: int = 0
+
+    for index, char in enumerate(recieved_data):
+        previous: int = last_seen.get(char, -1)
+        if previous >= window_start: # Repeat inside the window
+            window_start = previous + 1
+
+        last_seen[char] = index
+        distinct_run: int = index - window_start + 1
+
+        if all_occurrences:
+            for size in sizes:
+                if size > distinct_run:
+                    break
+                markers[size].append(index + 1)
+        else:
+            while next_size < len(sizes) and sizes[next_size] <= distinct_run:
+                markers[sizes[next_size]] = index + 1
+                next_size += 1
+
+            if next_size == len(sizes):
+                break
+
+    return markers
+
+async def watch_stream(
+    reader: asyncio.StreamReader,
+    detectors: list,
+    chunk_size: int=4096) -> list:
+    """Feed a live stream to several detectors until they have all found their marker
+    Only one chunk is held at a time
 
-        if len(unique) == unique_chars_required:
-            return start_window_index+unique_chars_required # Final value
+    Args:
+        reader (asyncio.StreamReader): The stream to read from
+        detectors (list): The MarkerDetectors to feed
+        chunk_size (int, optional): The most bytes to read at a time
 
-    return -1 # Couldn't find any
+    Returns:
+        list: The marker each detector found (-1 if the stream ended first)
+    """
+    while chunk := await reader.read(chunk_size):
+        # A list rather than a generator, so every detector sees the chunk
+        if all([detector.feed(chunk) != -1 for detector in detectors]):
+            break
+
+    return [detector.marker for detector in detectors]
 
 def find_start_of_packet(recieved_data: str) -> int:
     """Find the start of a packet (4 unique chars in a row)
@@ -57,14 +180,40 @@ def find_start_of_message_marker(recieved_data: str) -> int:
     """
     return find_start_of_x(recieved_data, 14)
 
+stages: dict[str, list] = { # What run.py --instrument times
+    "parse": [],
+    "compute": ["find_start_of_x", "find_markers"],
+    "aggregate": ["find_start_of_packet", "find_start_of_message_marker"],
+}
+
+def part_1(inp: str) -> int:
+    """Part 1 - the number of characters read before the start-of-packet marker
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The number of characters read before the start-of-packet marker
+    """
+    return find_start_of_packet(inp)
+
+def part_2(inp: str) -> int:
+    """Part 2 - the number of characters read before the start-of-message marker
+
+    Args:
+        inp (str): The raw input
+
+    Returns:
+        int: The number of characters read before the start-of-message marker
+    """
+    return find_start_of_message_marker(inp)
+
 def main():
     """Main function - do logic
     """
-    start_packet_index: int = find_start_of_packet(read_input())
-    print(start_packet_index)
-
-    start_of_message_marker: int = find_start_of_message_marker(read_input())
-    print(start_of_message_marker)
+    markers: dict = find_markers(read_input(), (4, 14))
+    print(markers[4])
+    print(markers[14])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,70 @@
+""" Check of watch_stream against a local socket standing in for a live stream
+    Sends the input in small writes and compares the markers with find_markers
+    Run with python 6-tuning_trouble/watch_stream_check.py [write size]
+"""
+
+import asyncio
+import sys
+
+from tuning_trouble_1 import MarkerDetector, find_markers, read_input, watch_stream
+
+async def send_in_writes(writer: asyncio.StreamWriter, data: bytes, write_size: int):
+    """Send data a few bytes at a time, so markers are split across reads
+
+    Args:
+        writer (asyncio.StreamWriter): The connection to send on
+        data (bytes): The data to send
+        write_size (int): The number of bytes in each write
+    """
+    try:
+        for start in range(0, len(data), write_size):
+            writer.write(data[start:start + write_size])
+            await writer.drain()
+    except ConnectionError:
+        pass # The reader stops listening once it has every marker
+    finally:
+        writer.close()
+
+async def watch_local_socket(data: bytes, sizes: tuple, write_size: int) -> list:
+    """Serve data on a local socket and watch it for markers
+
+    Args:
+        data (bytes): The datastream to serve
+        sizes (tuple): The number of unique characters of each marker
+        write_size (int): The number of bytes in each write
+
+    Returns:
+        list: The marker of each size (-1 if the stream ended first)
+    """
+    server: asyncio.Server = await asyncio.start_server(
+        lambda reader, writer: send_in_writes(writer, data, write_size), "127.0.0.1", 0
+    )
+    port: int = server.sockets[0].getsockname()[1]
+
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        markers: list = await watch_stream(reader, [MarkerDetector(size) for size in sizes])
+
+        writer.close()
+        await writer.wait_closed()
+
+    return markers
+
+def main():
+    """Main function - check watch_stream finds the same markers as find_markers
+    """
+    write_size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    sizes: tuple = (4, 14)
+    inp: str = read_input()
+
+    markers: dict = find_markers(inp, sizes)
+    expected: list = [markers[size] for size in sizes]
+    found: list = asyncio.run(watch_local_socket(inp.encode(), sizes, write_size))
+
+    print(f"watch_stream: {found}, find_markers: {expected}")
+
+    if found != expected:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
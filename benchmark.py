@@ -0,0 +1,166 @@
+""" Benchmarks for every public solver, across generated inputs of growing size
+    Results are saved as JSON and can be compared with a stored baseline
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+
+from generate_inputs import generate
+from run import load_day
+
+solvers: dict = {
+    1: {
+        "get_highest_calories": lambda day, inp: day.get_highest_calories(inp),
+        "get_sum_three_highest_calories":
+            lambda day, inp: day.get_sum_three_highest_calories(inp),
+        "get_sum_three_highest_calories (numpy)":
+            lambda day, inp: day.get_sum_three_highest_calories_numpy(inp),
+    },
+    2: {
+        "guided_total_score": lambda day, inp: day.guided_total_score(inp),
+        "guided_total_score (second rule set)": lambda day, inp: day.guided_total_score(inp, False),
+        "counted_total_score": lambda day, inp: day.counted_total_score(inp),
+        "GuideScorer": lambda day, inp: day.score_stream(io.StringIO(inp)),
+        "rank_mappings": lambda day, inp: day.rank_mappings(inp),
+    },
+    3: {
+        "items_in_both_compartments":
+            lambda day, inp: day.priority_sum(day.items_in_both_compartments(inp)),
+        "identifiers_common_between_groups":
+            lambda day, inp: day.priority_sum(day.identifiers_common_between_groups(inp)),
+        "compartment_priority_masked": lambda day, inp: day.compartment_priority_masked(inp),
+        "group_priority_masked": lambda day, inp: day.group_priority_masked(inp),
+        "audit_rucksacks": lambda day, inp: day.audit_rucksacks(day.iter_rucksacks(inp)),
+    },
+    4: {
+        "count_fully_contain_and_intersect":
+            lambda day, inp: day.count_fully_contain_and_intersect(inp),
+        "count_fully_contain_and_intersect (numpy)":
+            lambda day, inp: day.count_fully_contain_and_intersect(inp, "numpy"),
+        "build_overlap_index": lambda day, inp: day.build_overlap_index(inp),
+    },
+    5: {
+        "compute_rearrangement": lambda day, inp: day.compute_rearrangement(inp),
+        "compute_rearrangement (CrateMover 9001)":
+            lambda day, inp: day.compute_rearrangement(inp, 1),
+        "compute_rearrangement_segments": lambda day, inp: day.compute_rearrangement_segments(inp),
+        "find_message_reverse": lambda day, inp: day.find_message_reverse(inp),
+    },
+    6: {
+        "find_start_of_packet": lambda day, inp: day.find_start_of_packet(inp),
+        "find_start_of_message_marker": lambda day, inp: day.find_start_of_message_marker(inp),
+        "find_markers": lambda day, inp: day.find_markers(inp, (4, 14)),
+    },
+}
+
+def time_solver(solver, day, inp: str, repeats: int) -> float:
+    """Time a solver, keeping the best of several runs
+
+    Args:
+        solver: The function calling the solver with (module, input)
+        day: The day's module
+        inp (str): The input to solve
+        repeats (int): The number of runs
+
+    Returns:
+        float: The fastest run in seconds
+    """
+    best: float = float("inf")
+
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        solver(day, inp)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def run_benchmarks(days: list, sizes: list, repeats: int=3, name_filter: str="") -> dict:
+    """Time every solver of each day on generated inputs of each size
+
+    Args:
+        days (list): The days to benchmark
+        sizes (list): The input sizes to generate
+        repeats (int, optional): The number of runs of each solver, the best is kept
+        name_filter (str, optional): Only run solvers whose name contains this
+
+    Returns:
+        dict: The seconds each solver took, keyed "day/solver/size"
+    """
+    results: dict = {}
+
+    for day_number in days:
+        day = load_day(day_number)
+
+        for size in sizes:
+            inp: str = generate(day_number, size)
+
+            for name, solver in solvers[day_number].items():
+                if name_filter not in name:
+                    continue
+                if "numpy" in name and getattr(day, "np", None) is None:
+                    continue
+
+                key: str = f"{day_number}/{name}/{size}"
+                results[key] = time_solver(solver, day, inp, repeats)
+                print(f"{key}: {results[key]*1000:.3f} ms", flush=True)
+
+    return results
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Find the results that are slower than the baseline by more than the tolerance
+
+    Args:
+        results (dict): The new timings
+        baseline (dict): The stored timings
+        tolerance (float): The allowed slowdown, 0.2 for 20%
+
+    Returns:
+        list: (key, baseline seconds, new seconds) for each regression
+    """
+    return [
+        (key, baseline[key], seconds) for key, seconds in results.items()
+        if key in baseline and seconds > baseline[key] * (1 + tolerance)
+    ]
+
+def main():
+    """Main function - run the benchmarks, save them and check for regressions
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Advent of Code 2022 solvers")
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: all)")
+    parser.add_argument(
+        "-s", "--sizes", nargs="+", type=int, default=[1000, 10000, 100000],
+        help="input sizes in lines (characters for day 6)"
+    )
+    parser.add_argument("-r", "--repeats", type=int, default=3)
+    parser.add_argument("-k", "--filter", default="", help="only run solvers matching this")
+    parser.add_argument("-o", "--output", help="file to save the results to as JSON")
+    parser.add_argument("-b", "--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "-t", "--tolerance", type=float, default=0.2,
+        help="slowdown allowed before a result counts as a regression (default: 0.2)"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict = run_benchmarks(
+        args.days or sorted(solvers), args.sizes, args.repeats, args.filter
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions: list = find_regressions(results, json.load(baseline_file), args.tolerance)
+
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before*1000:.3f} ms -> {after*1000:.3f} ms")
+
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+""" Seeded generators for valid inputs to every day, at any scale
+    Sizes are in lines, except day 6 which is in characters
+    Inputs are generated a line at a time, so they can be written without being held in memory
+"""
+
+import argparse
+import random
+import string
+import sys
+from collections.abc import Iterable, Iterator
+
+batch_size: int = 65536
+
+def generate_day_1(size: int, rng: random.Random) -> Iterator[str]:
+    """Generate elf inventories of 1 to 15 items, separated by blank lines
+
+    Args:
+        size (int): The approximate number of lines
+        rng (random.Random): The seeded random source
+
+    Yields:
+        str: Each line of the generated input
+    """
+    lines: int = 0
+
+    while lines < size:
+        if lines:
+            yield "" # Blank line between elves
+
+        items: int = rng.randint(1, 15)
+        for _ in range(items):
+            yield str(rng.randint(1000, 60000))
+
+        lines += items + 1
+
+def generate_day_2(size: int, rng: random.Random) -> Iterator[str]:
+    """Generate a strategy guide of random rounds
+
+    Args:
+        size (int): The number of rounds
+        rng (random.Random): The seeded random source
+
+    Yields:
+        str: Each line of the generated input
+    """
+    rounds: list = [f"{enemy} {you}" for enemy in "ABC" for you in "XYZ"]
+
+    for start in range(0, size, batch_size):
+        yield from rng.choices(rounds, k=min(batch_size, size - start))
+
+def generate_rucksack(badge: str, pool: list, rng: random.Random) -> str:
+    """Generate a rucksack with exactly one item in both compartments, holding the badge
+
+    Args:
+        badge (str): The group's badge
+        pool (list): 17 items no other rucksack in the group uses
+        rng (random.Random): The seeded random source
+
+    Returns:
+        str: The rucksack
+    """
+    rng.shuffle(pool)
+    shared: str = rng.choice(pool + [badge])
+    others: list = [item for item in pool if item != shared]
+
+    left: list = [shared] + others[:8]
+    right: list = [shared] + others[8:16]
+
+    if shared != badge:
+        (left if rng.random() < 0.5 else right)[-1] = badge
+
+    for compartment in (left, right):
+        rng.shuffle(compartment)
+
+    return "".join(left) + "".join(right)
+
+def generate_day_3(size: int, rng: random.Random) -> Iterator[str]:
+    """Generate groups of three rucksacks which share exactly one badge
+
+    Args:
+        size (int): The number of rucksacks, rounded down to a multiple of 3
+        rng (random.Random): The seeded random source
+
+    Yields:
+        str: Each line of the generated input
+    """
+    for _ in range(size // 3):
+        items: list = list(string.ascii_letters)
+        rng.shuffle(items)
+        badge: str = items.pop()
+
+        for member in range(3):
+            yield generate_rucksack(badge, items[member*17:(member+1)*17], rng)
+
+def generate_day_4(size: int, rng: random.Random, max_section: int=99) -> Iterator[str]:
+    """Generate pairs of section assignments
+
+    Args:
+        size (int): The number of pairs
+        rng (random.Random): The seeded random source
+        max_section (int, optional): The highest section number
+
+    Yields:
+        str: Each line of the generated input
+    """
+    for _ in range(size):
+        bounds: list = [sorted((rng.randint(1, max_section), rng.randint(1, max_section)))
+            for _ in range(2)]
+        yield f"{bounds[0][0]}-{bounds[0][1]},{bounds[1][0]}-{bounds[1][1]}"
+
+def generate_day_5(
+    size: int,
+    rng: random.Random,
+    towers: int=9,
+    height: int=50) -> Iterator[str]:
+    """Generate a crate drawing and a list of valid move instructions
+
+    Args:
+        size (int): The number of instructions
+        rng (random.Random): The seeded random source
+        towers (int, optional): The number of towers
+        height (int, optional): The starting height of each tower,
+            fixed so the cost of each move does not grow with the number of instructions
+
+    Yields:
+        str: Each line of the generated input
+    """
+    heights: list = [height] * towers
+
+    for _ in range(height):
+        yield " ".join(f"[{rng.choice(string.ascii_uppercase)}]" for _ in range(towers))
+
+    yield " " + "   ".join(str(tower + 1) for tower in range(towers)) + " "
+    yield ""
+
+    for _ in range(size):
+        # Always leave a crate behind, as no tower may end up empty
+        where_from: int = rng.choice([tower for tower in range(towers) if heights[tower] > 1])
+        where_to: int = rng.choice([tower for tower in range(towers) if tower != where_from])
+        quantity: int = rng.randint(1, heights[where_from] - 1)
+
+        heights[where_from] -= quantity
+        heights[where_to] += quantity
+        yield f"move {quantity} from {where_from + 1} to {where_to + 1}"
+
+def generate_day_6(size: int, rng: random.Random) -> Iterator[str]:
+    """Generate a datastream with both markers at the very end, so finding them is a full scan
+
+    Args:
+        size (int): The number of characters
+        rng (random.Random): The seeded random source
+
+    Yields:
+        str: The generated input, which is a single line
+    """
+    marker: str = "".join(rng.sample(string.ascii_lowercase, 14))
+    filler: str = marker[:3] # Never 4 distinct in a row
+    filler_size: int = max(0, size - 14)
+
+    yield "".join(
+        "".join(rng.choices(filler, k=min(batch_size, filler_size - start)))
+        for start in range(0, filler_size, batch_size)
+    ) + marker
+
+generators: dict = {
+    1: generate_day_1,
+    2: generate_day_2,
+    3: generate_day_3,
+    4: generate_day_4,
+    5: generate_day_5,
+    6: generate_day_6,
+}
+
+def generate_lines(day: int, size: int, seed: int=0) -> Iterator[str]:
+    """Generate an input for a day a line at a time
+
+    Args:
+        day (int): The day number
+        size (int): The scale of the input
+        seed (int, optional): The random seed, the same seed always gives the same input
+
+    Returns:
+        Iterator[str]: Each line of the generated input, without its newline
+    """
+    return generators[day](size, random.Random(seed))
+
+def generate(day: int, size: int, seed: int=0) -> str:
+    """Generate a whole input for a day as one string, only for sizes that fit in memory
+
+    Args:
+        day (int): The day number
+        size (int): The scale of the input
+        seed (int, optional): The random seed, the same seed always gives the same input
+
+    Returns:
+        str: The generated input
+    """
+    return "\n".join(generate_lines(day, size, seed))
+
+def separate_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Put a newline between each line as it is written, as "\\n".join would
+
+    Args:
+        lines (Iterable[str]): The lines, without newlines
+
+    Yields:
+        str: Each line, and the newline before it
+    """
+    separator: str = ""
+
+    for line in lines:
+        yield separator
+        yield line
+        separator = "\n"
+
+def main():
+    """Main function - write a generated input to a file or stdout
+    """
+    parser = argparse.ArgumentParser(description="Generate inputs for Advent of Code 2022")
+    parser.add_argument("day", type=int, choices=sorted(generators))
+    parser.add_argument("size", type=int, help="number of lines (characters for day 6)")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write to (default: stdout)")
+    args: argparse.Namespace = parser.parse_args()
+
+    lines: Iterator[str] = generate_lines(args.day, args.size, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.writelines(separate_lines(lines))
+    else:
+        sys.stdout.writelines(separate_lines(lines))
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+""" Opt-in instrumentation of the parse, compute and aggregate stages of every day
+    Each day module lists the functions in each of its stages in a module-level stages dict
+    Nothing is wrapped until instrument() is called, so there is no cost while it is off
+"""
+
+import functools
+import inspect
+import time
+import tracemalloc
+from types import ModuleType
+
+stage_order: list = ["parse", "compute", "aggregate"]
+
+class Instrumentation:
+    """Call counts, time and peak memory of each instrumented function
+    Times include any instrumented functions called inside, as do peaks,
+    while own times leave out the time spent in instrumented callees
+    """
+    trace_memory: bool
+
+    stats: dict
+    originals: list
+    memory_stack: list
+    callee_seconds: list
+
+    def __init__(self, trace_memory: bool=False):
+        self.trace_memory = trace_memory
+
+        self.stats = {} # (day, stage, name) - [calls, seconds, own seconds, peak bytes]
+        self.originals = [] # (module, name, function) to put back
+        self.memory_stack = [] # [traced bytes at start, highest peak of callees] per open call
+        self.callee_seconds = [] # Time spent in instrumented callees, per open call
+
+    def enter_memory(self):
+        """Start tracking the peak memory of a call, remembering the caller's peak so far
+        """
+        current, peak = tracemalloc.get_traced_memory()
+
+        if self.memory_stack:
+            self.memory_stack[-1][1] = max(self.memory_stack[-1][1], peak)
+
+        tracemalloc.reset_peak()
+        self.memory_stack.append([current, 0])
+
+    def exit_memory(self) -> int:
+        """Finish tracking the peak memory of a call
+
+        Returns:
+            int: The most memory the call had allocated at once, in bytes
+        """
+        start, callee_peak = self.memory_stack.pop()
+        peak: int = max(tracemalloc.get_traced_memory()[1], callee_peak)
+
+        if self.memory_stack:
+            self.memory_stack[-1][1] = max(self.memory_stack[-1][1], peak)
+
+        return peak - start
+
+    def enter_call(self):
+        """Start measuring a call
+        """
+        if self.trace_memory:
+            self.enter_memory()
+
+        self.callee_seconds.append(0.0)
+
+    def exit_call(self, key: tuple, seconds: float, calls: int=1):
+        """Finish measuring a call and add it to its function's totals
+
+        Args:
+            key (tuple): The day, stage and function name
+            seconds (float): The time taken
+            calls (int, optional): The number of calls to count
+        """
+        peak: int = self.exit_memory() if self.trace_memory else 0
+        own_seconds: float = seconds - self.callee_seconds.pop()
+
+        if self.callee_seconds:
+            self.callee_seconds[-1] += seconds
+
+        stat: list = self.stats.setdefault(key, [0, 0.0, 0.0, 0])
+        stat[0] += calls
+        stat[1] += seconds
+        stat[2] += own_seconds
+        stat[3] = max(stat[3], peak)
+
+    def wrap(self, key: tuple, function):
+        """Wrap a function to record its calls, time and peak memory
+        Generators are timed each time they are resumed, not just when created
+
+        Args:
+            key (tuple): The day, stage and function name
+            function: The function to wrap
+
+        Returns:
+            The wrapped function
+        """
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                generator = function(*args, **kwargs)
+                calls: int = 1
+
+                while True:
+                    self.enter_call()
+                    start: float = time.perf_counter()
+
+                    try:
+                        value = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.exit_call(key, time.perf_counter() - start, calls)
+                        calls = 0
+
+                    yield value
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            self.enter_call()
+            start: float = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.exit_call(key, time.perf_counter() - start)
+
+        return wrapper
+
+    def instrument(self, module: ModuleType, day: int):
+        """Swap the functions in a day's stages dict for instrumented ones
+        Calls from inside the module are caught too, as they look the functions up by name
+
+        Args:
+            module (ModuleType): The day's module
+            day (int): The day number
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        for stage, names in getattr(module, "stages", {}).items():
+            for name in names:
+                function = getattr(module, name, None)
+
+                if function is not None:
+                    self.originals.append((module, name, function))
+                    setattr(module, name, self.wrap((day, stage, name), function))
+
+    def restore(self):
+        """Put every instrumented function back as it was
+        """
+        for module, name, function in reversed(self.originals):
+            setattr(module, name, function)
+
+        self.originals = []
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def report(self) -> str:
+        """Lay out the measurements as a table
+        Each stage ends with a total of its functions' own times, so no time is counted twice
+
+        Returns:
+            str: One line per function that was called and one per stage, by day and stage
+        """
+        lines: list = [
+            f"{'day':>3}  {'stage':<9}  {'function':<36}  {'calls':>10}  {'ms':>10}"
+            f"  {'own ms':>10}  {'peak KiB':>10}"
+        ]
+
+        totals: dict = {} # (day, stage) - [calls, own seconds, peak bytes]
+        for (day, stage, _), (calls, _, own_seconds, peak) in self.stats.items():
+            total: list = totals.setdefault((day, stage), [0, 0.0, 0])
+            total[0] += calls
+            total[1] += own_seconds
+            total[2] = max(total[2], peak)
+
+        for day, stage in sorted(totals, key=lambda key: (key[0], stage_order.index(key[1]))):
+            for (stat_day, stat_stage, name), (calls, seconds, own_seconds, peak) in \
+                    self.stats.items():
+                if (stat_day, stat_stage) == (day, stage):
+                    lines.append(
+                        f"{day:>3}  {stage:<9}  {name:<36}  {calls:>10}  {seconds*1000:>10.3f}"
+                        f"  {own_seconds*1000:>10.3f}  {peak/1024:>10.1f}"
+                    )
+
+            calls, own_seconds, peak = totals[(day, stage)]
+            lines.append(
+                f"{day:>3}  {stage:<9}  {'(stage total)':<36}  {calls:>10}  {'':>10}"
+                f"  {own_seconds*1000:>10.3f}  {peak/1024:>10.1f}"
+            )
+
+        return "\n".join(lines)
@@ -4,19 +4,51 @@ echo """ Day :
 echo     https://adventofcode.com/2022/day/
 echo """
 echo.
-echo def read_input^(^) ^-^> str:
-echo     """Read the inputs from inputs.txt
+echo import os
+echo import sys
+echo.
+echo sys.path.append^(os.path.dirname^(os.path.dirname^(os.path.abspath^(__file__^)^)^)^) # For shared_input
+echo.
+echo from shared_input import load_input
+echo.
+echo input_path: str = os.path.join^(os.path.dirname^(os.path.abspath^(__file__^)^), "input.txt"^)
+echo.
+echo def read_input^(path: str=input_path^) ^-^> str:
+echo     """Read the inputs from inputs.txt, through the shared memory-mapped cache
+echo.
+echo     Args:
+echo         path ^(str, optional^): The input file to read, defaults to this day's input.txt
 echo.
 echo     Returns:
 echo         str: A raw string of the inputs
 echo     """
-echo     with open^("6-tuning_trouble/input.txt", "r", encoding="utf-8"^) as input_file:
-echo         return input_file.read^(^)
+echo     return load_input^(path^).text
+echo.
+echo stages: dict[str, list] = { # What run.py --instrument times
+echo     "parse": [],
+echo     "compute": [],
+echo     "aggregate": [],
+echo }
+echo.
+echo def part_1^(inp: str^):
+echo     """Part 1 - 
+echo.
+echo     Args:
+echo         inp ^(str^): The raw input
+echo     """
+echo.
+echo def part_2^(inp: str^):
+echo     """Part 2 - 
+echo.
+echo     Args:
+echo         inp ^(str^): The raw input
+echo     """
 echo.
 echo def main^(^):
 echo     """Main function - do logic
 echo     """
-echo     print^(^)
+echo     print^(f"1: {part_1^(read_input^(^)^)}"^)
+echo     print^(f"2: {part_2^(read_input^(^)^)}"^)
 echo.
 echo if __name__ == "__main__":
 echo     main^(^)
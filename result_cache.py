@@ -0,0 +1,155 @@
+""" On-disk cache of answers, keyed by the content of everything that decides them
+    The key hashes the input bytes, the day and part, and the source of the day's module
+"""
+
+import hashlib
+import json
+import os
+
+default_cache_dir: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".aoc_cache")
+default_max_bytes: int = 64 * 1024 * 1024
+
+class ResultCache:
+    """A directory of answers, one small JSON file each, trimmed least recently used first
+    """
+    cache_dir: str
+    max_bytes: int
+
+    def __init__(self, cache_dir: str=default_cache_dir, max_bytes: int=default_max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(day: int, part: int, input_digest: str, source_digest: str) -> str:
+        """Make the key for an answer
+
+        Args:
+            day (int): The day number
+            part (int): The part number
+            input_digest (str): The SHA-256 of the input bytes
+            source_digest (str): The SHA-256 of the day's source
+
+        Returns:
+            str: The key, as a hex digest
+        """
+        return hashlib.sha256(f"{day}/{part}/{input_digest}/{source_digest}".encode()).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """The file an answer is stored in
+
+        Args:
+            key (str): The answer's key
+
+        Returns:
+            str: The path of its file
+        """
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """Look up an answer, marking it as recently used
+
+        Args:
+            key (str): The answer's key
+
+        Returns:
+            tuple[bool, object]: Whether it was found, the answer
+        """
+        path: str = self.entry_path(key)
+
+        try:
+            with open(path, "r", encoding="utf-8") as entry_file:
+                answer = json.load(entry_file)["answer"]
+        except (OSError, ValueError, KeyError):
+            return False, None
+
+        os.utime(path) # Last used time drives eviction
+
+        return True, answer
+
+    def put(self, key: str, day: int, part: int, answer):
+        """Store an answer
+        Call evict() after a batch of puts to bring the cache back within max_bytes
+
+        Args:
+            key (str): The answer's key
+            day (int): The day number, kept so a day can be invalidated
+            part (int): The part number
+            answer: The answer, which must be JSON serialisable
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        path: str = self.entry_path(key)
+        temporary_path: str = f"{path}.{os.getpid()}.tmp" # Other processes may write the same key
+
+        with open(temporary_path, "w", encoding="utf-8") as entry_file:
+            json.dump({"day": day, "part": part, "answer": answer}, entry_file)
+
+        os.replace(temporary_path, path)
+
+    def entries(self) -> list:
+        """List every stored answer
+
+        Returns:
+            list: (path, size, last used time) of each entry
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        return [
+            (entry.path, entry.stat().st_size, entry.stat().st_mtime)
+            for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")
+        ]
+
+    def evict(self):
+        """Remove the least recently used answers until the cache fits in max_bytes
+        """
+        entries: list = sorted(self.entries(), key=lambda entry: entry[2])
+        total: int = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass # Already evicted by another process
+
+            total -= size
+
+    def invalidate(self, days: list=None) -> int:
+        """Remove stored answers
+
+        Args:
+            days (list, optional): Only remove answers for these days, defaults to all
+
+        Returns:
+            int: The number of answers removed
+        """
+        removed: int = 0
+
+        for path, _, _ in self.entries():
+            if days:
+                try:
+                    with open(path, "r", encoding="utf-8") as entry_file:
+                        if json.load(entry_file).get("day") not in days:
+                            continue
+                except (OSError, ValueError):
+                    pass # Unreadable entries are removed either way
+
+            os.remove(path)
+            removed += 1
+
+        return removed
+
+def file_digest(path: str) -> str:
+    """Hash a file's contents
+
+    Args:
+        path (str): The file
+
+    Returns:
+        str: Its SHA-256 as a hex digest
+    """
+    with open(path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
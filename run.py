@@ -0,0 +1,293 @@
+""" Runner for every day's solutions
+    Discovers the N-name/name_1.py modules and times each part on any input
+"""
+
+import argparse
+import cProfile
+import glob
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import ModuleType
+
+from instrumentation import Instrumentation
+from result_cache import ResultCache, default_cache_dir, file_digest
+from shared_input import load_input
+
+root_path: str = os.path.dirname(os.path.abspath(__file__))
+
+loaded_days: dict = {}
+source_digests: dict = {}
+
+def discover_days() -> dict[int, str]:
+    """Find every day's solution module without importing any of them
+
+    Returns:
+        dict[int, str]: The path of each day's module, by day number
+    """
+    days: dict[int, str] = {}
+
+    for path in glob.glob(os.path.join(root_path, "[0-9]*-*", "*_1.py")):
+        day: str = os.path.basename(os.path.dirname(path)).split("-")[0]
+
+        if day.isdigit():
+            days[int(day)] = path
+
+    return dict(sorted(days.items()))
+
+def load_day(day: int) -> ModuleType:
+    """Import a day's module by its path, only the first time it is asked for
+
+    Args:
+        day (int): The day number
+
+    Returns:
+        ModuleType: The day's module
+    """
+    if day not in loaded_days:
+        days: dict[int, str] = discover_days()
+
+        if day not in days:
+            raise ValueError(f"no solution found for day {day}")
+
+        spec = importlib.util.spec_from_file_location(f"day_{day}", days[day])
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        loaded_days[day] = module
+
+    return loaded_days[day]
+
+def run_part(day: int, part: int, path: str=None, cache_dir: str=None) -> tuple:
+    """Run one part of a day on an input file, timing only the solve
+    With a cache directory, an answer already worked out for the same input and source is reused
+
+    Args:
+        day (int): The day number
+        part (int): The part to run (1 or 2)
+        path (str, optional): The input file, defaults to the day's input.txt
+        cache_dir (str, optional): The result cache to use, defaults to no caching
+
+    Returns:
+        tuple: The answer, wall clock seconds, CPU seconds, whether it came from the cache
+    """
+    module: ModuleType = load_day(day)
+    path = path or module.input_path
+
+    wall_start: float = time.perf_counter()
+    cpu_start: float = time.process_time()
+
+    if cache_dir:
+        if day not in source_digests:
+            source_digests[day] = file_digest(module.__file__)
+
+        cache: ResultCache = ResultCache(cache_dir)
+        key: str = cache.make_key(day, part, load_input(path).digest, source_digests[day])
+        found, answer = cache.get(key)
+
+        if found:
+            return answer, time.perf_counter() - wall_start, time.process_time() - cpu_start, True
+
+    inp: str = module.read_input(path)
+    solve = getattr(module, f"part_{part}")
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    answer = solve(inp)
+
+    wall: float = time.perf_counter() - wall_start
+    cpu: float = time.process_time() - cpu_start
+
+    if cache_dir:
+        cache.put(key, day, part, answer)
+
+    return answer, wall, cpu, False
+
+def run_job(day: int, part: int, path: str=None, cache_dir: str=None):
+    """Run one part of a day, catching any error so one bad input doesn't lose the other jobs
+
+    Args:
+        day (int): The day number
+        part (int): The part to run (1 or 2)
+        path (str, optional): The input file, defaults to the day's input.txt
+        cache_dir (str, optional): The result cache to use, defaults to no caching
+
+    Returns:
+        The result of run_part, or the exception raised instead
+    """
+    try:
+        return run_part(day, part, path, cache_dir)
+    except Exception as error: # Reported with the results instead
+        return error
+
+def expand_inputs(paths: list) -> list:
+    """Expand any directories in a list of inputs into the files inside them
+
+    Args:
+        paths (list): Input files and directories
+
+    Returns:
+        list: Every input file, directories expanded in name order
+    """
+    files: list = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                entry.path for entry in os.scandir(path) if entry.is_file()
+            )
+        else:
+            files.append(path)
+
+    return files
+
+def run_jobs(jobs: list, workers: int=1, cache_dir: str=None) -> list:
+    """Run (day, part, input path) jobs, spreading them over processes if workers > 1
+    Each worker imports the days it is given once and keeps them for later jobs
+
+    Args:
+        jobs (list): The (day, part, input path) of each job
+        workers (int, optional): The number of processes to use
+        cache_dir (str, optional): The result cache to use, defaults to no caching
+
+    Returns:
+        list: The result of each job, or the exception it raised, in the same order as the jobs
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(*job, cache_dir) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            run_job, *zip(*jobs), repeat(cache_dir), chunksize=max(1, len(jobs) // (workers * 4))
+        ))
+
+def format_result(day: int, part: int, result, path: str=None) -> str:
+    """Format the result of a part for printing
+
+    Args:
+        day (int): The day number
+        part (int): The part number
+        result: The answer, wall clock seconds, CPU seconds, whether it was cached,
+            or the exception the part raised
+        path (str, optional): The input file, shown when it is not the day's own
+
+    Returns:
+        str: One line describing the result
+    """
+    source: str = f" [{path}]" if path else ""
+
+    if isinstance(result, Exception):
+        return f"Day {day} part {part}{source}: ERROR {type(result).__name__}: {result}"
+
+    answer, wall, cpu, cached = result
+
+    return f"Day {day} part {part}{source}: {answer}" \
+        f"  (wall {wall*1000:.2f} ms, cpu {cpu*1000:.2f} ms{', cached' if cached else ''})"
+
+def parse_args(argv: list=None) -> argparse.Namespace:
+    """Parse the command line arguments
+
+    Args:
+        argv (list, optional): The arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run and time Advent of Code 2022 solutions")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-p", "--part", type=int, choices=(1, 2), help="only run this part")
+    parser.add_argument(
+        "-i", "--input", nargs="+", action="extend", default=[],
+        help="input files or directories of inputs to use instead of each day's input.txt"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="number of processes to spread the jobs over (0 for one per CPU)"
+    )
+    parser.add_argument(
+        "--instrument", action="store_true",
+        help="report calls and time of each parse, compute and aggregate stage (runs in-process)"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="also report the peak memory of each stage with tracemalloc (implies --instrument)"
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH", help="save a cProfile of the run to PATH (runs in-process)"
+    )
+    parser.add_argument(
+        "-c", "--cache", action="store_true",
+        help="reuse answers for inputs and solutions that have not changed since they were cached"
+    )
+    parser.add_argument(
+        "--cache-dir", default=default_cache_dir, help="where cached answers are kept"
+    )
+    parser.add_argument(
+        "--invalidate", action="store_true",
+        help="remove the cached answers of the chosen days (default: all) and exit"
+    )
+
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    missing: list = [day for day in args.days if day not in discover_days()]
+    if missing:
+        parser.error(f"no solution found for day {', '.join(map(str, missing))}")
+
+    return args
+
+def main(argv: list=None):
+    """Main function - run the chosen days and parts and print their results
+    """
+    args: argparse.Namespace = parse_args(argv)
+
+    if args.invalidate:
+        removed: int = ResultCache(args.cache_dir).invalidate(args.days)
+        print(f"Removed {removed} cached answer{'s' if removed != 1 else ''}")
+        return
+
+    days: list = args.days or list(discover_days())
+    parts: tuple = (args.part,) if args.part else (1, 2)
+    inputs: list = expand_inputs(args.input) or [None]
+    workers: int = args.jobs or os.cpu_count()
+
+    instrumentation: Instrumentation = None
+    if args.instrument or args.trace_memory:
+        instrumentation = Instrumentation(args.trace_memory)
+        for day in days:
+            instrumentation.instrument(load_day(day), day)
+
+    profiler: cProfile.Profile = cProfile.Profile() if args.profile else None
+    if instrumentation or profiler:
+        workers = 1 # Measurements are only taken in this process
+
+    jobs: list = [(day, part, path) for day in days for path in inputs for part in parts]
+
+    if profiler:
+        profiler.enable()
+
+    results: list = run_jobs(jobs, workers, args.cache_dir if args.cache else None)
+
+    if args.cache:
+        ResultCache(args.cache_dir).evict()
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    for (day, part, path), result in zip(jobs, results):
+        print(format_result(day, part, result, path))
+
+    if instrumentation:
+        print()
+        print(instrumentation.report())
+        instrumentation.restore()
+
+    if any(isinstance(result, Exception) for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
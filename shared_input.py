@@ -0,0 +1,136 @@
+""" Shared input loading for every day
+    Each input is memory-mapped once and cached by path and modification time,
+    up to max_cached_bytes of mappings and decoded text
+"""
+
+import hashlib
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from functools import cached_property
+
+max_cached_bytes: int = 256 * 1024 * 1024
+
+cached_inputs: OrderedDict = OrderedDict()
+
+class SharedInput:
+    """A memory-mapped input file, whose text and line offsets are worked out once when needed
+    """
+    path: str
+    data: memoryview
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, "rb") as input_file:
+            if os.fstat(input_file.fileno()).st_size == 0: # Empty files can't be mapped
+                self.data = memoryview(b"")
+            else:
+                self.data = memoryview(
+                    mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def held_bytes(self) -> int:
+        """The memory held for the input, counting its decoded text only once it has been made
+
+        Returns:
+            int: The size of the mapping plus the length of the decoded text
+        """
+        return len(self.data) + len(self.__dict__.get("text", ""))
+
+    def release(self):
+        """Drop the decoded text and line offsets, which are worked out again if needed
+        """
+        self.__dict__.pop("text", None)
+        self.__dict__.pop("line_offsets", None)
+
+    @cached_property
+    def text(self) -> str:
+        """The input decoded once, with newlines as open() would give them
+
+        Returns:
+            str: A raw string of the input
+        """
+        text: str = str(self.data, "utf-8")
+
+        return text.replace("\r\n", "\n") if "\r" in text else text
+
+    @cached_property
+    def digest(self) -> str:
+        """The SHA-256 of the input bytes, worked out once
+
+        Returns:
+            str: The hex digest
+        """
+        return hashlib.sha256(self.data).hexdigest()
+
+    @cached_property
+    def line_offsets(self) -> array:
+        """The byte offset of the start of each line
+
+        Returns:
+            array: The offset each line starts at, in order
+        """
+        offsets: array = array("q", [0])
+        data: bytes = self.data.obj if isinstance(self.data.obj, mmap.mmap) else bytes(self.data)
+
+        newline: int = data.find(b"\n")
+        while newline != -1:
+            offsets.append(newline + 1)
+            newline = data.find(b"\n", newline + 1)
+
+        return offsets
+
+    def line(self, index: int) -> memoryview:
+        """Get one line of the input without copying it
+
+        Args:
+            index (int): The line number, from 0
+
+        Returns:
+            memoryview: The bytes of that line, without its line ending
+        """
+        offsets: array = self.line_offsets
+        end: int = offsets[index + 1] - 1 if index + 1 < len(offsets) else len(self.data)
+
+        if end > offsets[index] and self.data[end - 1] == ord("\r"):
+            end -= 1
+
+        return self.data[offsets[index]:end]
+
+def load_input(path: str) -> SharedInput:
+    """Load an input, reusing the cached mapping while the file is unchanged
+    Least recently used inputs are dropped, and their text released, while the cache holds
+    more than max_cached_bytes - the input just loaded is always kept
+
+    Args:
+        path (str): The input file
+
+    Returns:
+        SharedInput: The shared view of that input
+    """
+    key: str = os.path.abspath(path)
+    stats: os.stat_result = os.stat(key)
+    stamp: tuple = (stats.st_mtime_ns, stats.st_size)
+
+    cached = cached_inputs.get(key)
+    if cached and cached[0] == stamp:
+        cached_inputs.move_to_end(key)
+        return cached[1]
+
+    shared_input: SharedInput = SharedInput(key)
+    cached_inputs[key] = (stamp, shared_input)
+    cached_inputs.move_to_end(key)
+
+    held: int = sum(cached[1].held_bytes() for cached in cached_inputs.values())
+
+    while len(cached_inputs) > 1 and held > max_cached_bytes:
+        _, (_, evicted) = cached_inputs.popitem(last=False)
+        held -= evicted.held_bytes()
+        evicted.release()
+
+    return shared_input